@@ -1,4 +1,4 @@
 #!/bin/bash
 cd /home/ubuntu/whoop-mcp-server
 source venv/bin/activate
-python src/whoop_http_server_v2.py
+python -m src.whoop_http_server_v2
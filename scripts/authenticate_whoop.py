@@ -6,14 +6,15 @@ This script helps you re-authenticate with the Whoop API when your access token
 It will guide you through the OAuth flow and save your new tokens.
 """
 
-import json
 import os
 import secrets
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlencode, parse_qs, urlparse
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 # Add parent directory to path
@@ -30,33 +31,36 @@ CLIENT_SECRET = os.getenv("WHOOP_CLIENT_SECRET")
 REDIRECT_URI = os.getenv("WHOOP_REDIRECT_URI")
 TOKEN_FILE = Path(__file__).parent.parent / "config" / "tokens.json"
 
-WHOOP_AUTH_URL = "https://api.prod.whoop.com/oauth/oauth2/auth"
-WHOOP_TOKEN_URL = "https://api.prod.whoop.com/oauth/oauth2/token"
+WHOOP_API_BASE = "https://api.prod.whoop.com"
+WHOOP_AUTH_URL = f"{WHOOP_API_BASE}/oauth/oauth2/auth"
+WHOOP_TOKEN_URL = "/oauth/oauth2/token"
+WHOOP_PROFILE_URL = "/developer/v2/user/profile/basic"
 
 # Required scopes
 SCOPES = "read:recovery read:cycles read:workout read:sleep read:profile read:body_measurement offline"
 
+# Only the state changes between authorization URLs, so encode the rest once
+STATIC_AUTH_QUERY = urlencode({
+    "response_type": "code",
+    "client_id": CLIENT_ID,
+    "redirect_uri": REDIRECT_URI,
+    "scope": SCOPES
+})
+
 
 def generate_authorization_url():
     """Generate OAuth authorization URL."""
     state = secrets.token_urlsafe(32)
     
-    params = {
-        "response_type": "code",
-        "client_id": CLIENT_ID,
-        "redirect_uri": REDIRECT_URI,
-        "scope": SCOPES,
-        "state": state
-    }
-    
-    auth_url = f"{WHOOP_AUTH_URL}?{urlencode(params)}"
+    # token_urlsafe output is already URL-safe, no quoting needed
+    auth_url = f"{WHOOP_AUTH_URL}?{STATIC_AUTH_QUERY}&state={state}"
     return auth_url, state
 
 
-def exchange_code_for_tokens(authorization_code: str):
+def exchange_code_for_tokens(client: httpx.Client, authorization_code: str):
     """Exchange authorization code for access and refresh tokens."""
     try:
-        response = httpx.post(WHOOP_TOKEN_URL, data={
+        response = client.post(WHOOP_TOKEN_URL, data={
             "grant_type": "authorization_code",
             "code": authorization_code,
             "redirect_uri": REDIRECT_URI,
@@ -65,7 +69,7 @@ def exchange_code_for_tokens(authorization_code: str):
         })
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             print(f"❌ Error exchanging code for tokens: {response.status_code}")
             print(response.text)
@@ -77,21 +81,25 @@ def exchange_code_for_tokens(authorization_code: str):
 
 def save_tokens(token_data: dict):
     """Save tokens to file."""
-    from datetime import datetime
-    
+    # orjson encodes aware datetimes natively, matching the server's updated_at format
     tokens = {
         "access_token": token_data["access_token"],
         "refresh_token": token_data.get("refresh_token", ""),
-        "updated_at": datetime.now().isoformat()
+        "updated_at": datetime.now(timezone.utc)
     }
     
     TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(tokens, f, indent=2)
-    
-    # Secure the token file
-    os.chmod(TOKEN_FILE, 0o600)
+    # Create the file 0600 from the start and swap it in atomically, so the tokens are
+    # never readable by others or left half-written
+    tmp_path = TOKEN_FILE.with_suffix(".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, orjson.dumps(tokens, option=orjson.OPT_INDENT_2))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, TOKEN_FILE)
     print(f"✅ Tokens saved to {TOKEN_FILE}")
 
 
@@ -163,37 +171,43 @@ def main():
         print(f"❌ Error parsing callback URL: {e}")
         return 1
     
-    # Exchange code for tokens
-    print("\n🔄 Step 4: Exchanging authorization code for tokens...")
-    token_data = exchange_code_for_tokens(auth_code)
-    
-    if not token_data:
-        print("❌ Failed to get tokens")
-        return 1
-    
-    # Save tokens
-    print("\n💾 Step 5: Saving tokens...")
-    save_tokens(token_data)
-    
-    # Verify tokens
-    print("\n✅ Step 6: Verifying tokens...")
-    access_token = token_data["access_token"]
-    try:
-        response = httpx.get(
-            "https://api.prod.whoop.com/developer/v2/user/profile/basic",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    # Share one keep-alive connection between the token exchange and the verification
+    with httpx.Client(
+        base_url=WHOOP_API_BASE,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=4)
+    ) as client:
+        # Exchange code for tokens
+        print("\n🔄 Step 4: Exchanging authorization code for tokens...")
+        token_data = exchange_code_for_tokens(client, auth_code)
         
-        if response.status_code == 200:
-            profile = response.json()
-            print(f"✅ Successfully authenticated!")
-            print(f"   User: {profile.get('first_name', '')} {profile.get('last_name', '')}")
-            print(f"   Email: {profile.get('email', '')}")
-        else:
-            print(f"⚠️  Token saved but verification failed: {response.status_code}")
-            print(response.text)
-    except Exception as e:
-        print(f"⚠️  Token saved but verification failed: {e}")
+        if not token_data:
+            print("❌ Failed to get tokens")
+            return 1
+        
+        # Save tokens
+        print("\n💾 Step 5: Saving tokens...")
+        save_tokens(token_data)
+        
+        # Verify tokens
+        print("\n✅ Step 6: Verifying tokens...")
+        access_token = token_data["access_token"]
+        try:
+            response = client.get(
+                WHOOP_PROFILE_URL,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code == 200:
+                profile = orjson.loads(response.content)
+                print(f"✅ Successfully authenticated!")
+                print(f"   User: {profile.get('first_name', '')} {profile.get('last_name', '')}")
+                print(f"   Email: {profile.get('email', '')}")
+            else:
+                print(f"⚠️  Token saved but verification failed: {response.status_code}")
+                print(response.text)
+        except Exception as e:
+            print(f"⚠️  Token saved but verification failed: {e}")
     
     print("\n" + "=" * 50)
     print("🎉 Authentication complete!")
@@ -0,0 +1 @@
+"""Whoop MCP server modules."""
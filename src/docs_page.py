@@ -0,0 +1,23 @@
+"""
+Rendering shared by the documentation page servers.
+
+Both pages are static HTML apart from a "Last Updated" date, so each is formatted once
+a day and served as pre-encoded bytes.
+"""
+
+from datetime import date
+from functools import lru_cache
+from fastapi.responses import Response
+
+@lru_cache(maxsize=4)
+def render_page(template: str, day: date) -> bytes:
+    """Render a page template for the given day (cached until the date changes)."""
+    return template.format(today=day.isoformat()).encode("utf-8")
+
+def page_response(template: str) -> Response:
+    """Serve today's rendering of a page template, cacheable by browsers for an hour."""
+    return Response(
+        content=render_page(template, date.today()),
+        media_type="text/html",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
@@ -4,11 +4,11 @@ OAuth Configuration Server for MCP Agent Builders.
 Provides OAuth configuration endpoints for agent builders to connect to the Whoop MCP server.
 """
 
-import json
 import os
 from pathlib import Path
+import orjson
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,16 +16,48 @@ env_path = Path(__file__).parent.parent / "config" / ".env"
 if env_path.exists():
     load_dotenv(dotenv_path=env_path)
 
+# OAuth settings never change while the server runs, so read them once
+CLIENT_ID = os.getenv("WHOOP_CLIENT_ID")
+CLIENT_SECRET = os.getenv("WHOOP_CLIENT_SECRET")
+AUTHORIZATION_URL = "https://api.prod.whoop.com/oauth/oauth2/auth"
+TOKEN_URL = "https://api.prod.whoop.com/oauth/oauth2/token"
+REDIRECT_URI = "https://mcp.leonhoulier.com/whoop/callback"
+SCOPES = "read:recovery read:cycles read:workout read:sleep read:profile read:body_measurement"
+
+OAUTH_CONFIG = {
+    "clientId": CLIENT_ID,
+    "clientSecret": CLIENT_SECRET,
+    "authorizationUrl": AUTHORIZATION_URL,
+    "tokenUrl": TOKEN_URL,
+    "redirectUri": REDIRECT_URI,
+    "scope": SCOPES
+}
+
+MCP_CONFIG = {
+    "mcpServers": {
+        "whoop-mcp": {
+            "command": "python",
+            "args": ["/home/ubuntu/whoop-mcp-server/src/whoop_mcp_server.py"],
+            "env": {
+                "WHOOP_CLIENT_ID": CLIENT_ID,
+                "WHOOP_CLIENT_SECRET": CLIENT_SECRET,
+                "WHOOP_REDIRECT_URI": REDIRECT_URI
+            }
+        }
+    },
+    "oauth": {
+        "whoop": OAUTH_CONFIG
+    }
+}
+
 app = FastAPI(
     title="Whoop MCP OAuth Configuration",
     description="OAuth configuration for Whoop MCP Server",
     version="1.0.0"
 )
 
-@app.get("/", response_class=HTMLResponse)
-def root():
-    """Root endpoint with OAuth configuration information."""
-    return HTMLResponse(content=f"""
+# Pre-rendered response bodies, built once at import instead of on every request
+ROOT_HTML = f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -51,12 +83,12 @@ def root():
             
             <div class="oauth-config">
                 <h3>🔐 OAuth2 Configuration</h3>
-                <p><strong>Client ID:</strong> <code>{os.getenv("WHOOP_CLIENT_ID", "Not configured")}</code></p>
-                <p><strong>Client Secret:</strong> <code>{os.getenv("WHOOP_CLIENT_SECRET", "Not configured")[:20]}...</code></p>
-                <p><strong>Authorization URL:</strong> <code>https://api.prod.whoop.com/oauth/oauth2/auth</code></p>
-                <p><strong>Token URL:</strong> <code>https://api.prod.whoop.com/oauth/oauth2/token</code></p>
-                <p><strong>Redirect URI:</strong> <code>https://mcp.leonhoulier.com/whoop/callback</code></p>
-                <p><strong>Scopes:</strong> <code>read:recovery read:cycles read:workout read:sleep read:profile read:body_measurement</code></p>
+                <p><strong>Client ID:</strong> <code>{CLIENT_ID or "Not configured"}</code></p>
+                <p><strong>Client Secret:</strong> <code>{(CLIENT_SECRET or "Not configured")[:20]}...</code></p>
+                <p><strong>Authorization URL:</strong> <code>{AUTHORIZATION_URL}</code></p>
+                <p><strong>Token URL:</strong> <code>{TOKEN_URL}</code></p>
+                <p><strong>Redirect URI:</strong> <code>{REDIRECT_URI}</code></p>
+                <p><strong>Scopes:</strong> <code>{SCOPES}</code></p>
             </div>
             
             <h3>🎯 MCP Server Details</h3>
@@ -93,47 +125,36 @@ def root():
         </div>
     </body>
     </html>
-    """)
+    """.encode("utf-8")
+OAUTH_CONFIG_JSON = orjson.dumps(OAUTH_CONFIG)
+MCP_CONFIG_JSON = orjson.dumps(MCP_CONFIG)
+
+@app.get("/", response_class=HTMLResponse)
+def root():
+    """Root endpoint with OAuth configuration information."""
+    return Response(content=ROOT_HTML, media_type="text/html")
 
 @app.get("/oauth-config")
 def get_oauth_config():
     """Get OAuth2 configuration in JSON format."""
-    return JSONResponse(content={
-        "clientId": os.getenv(WHOOP_CLIENT_ID),
-        "clientSecret": os.getenv("WHOOP_CLIENT_SECRET"),
-        "authorizationUrl": "https://api.prod.whoop.com/oauth/oauth2/auth",
-        "tokenUrl": "https://api.prod.whoop.com/oauth/oauth2/token",
-        "redirectUri": "https://mcp.leonhoulier.com/whoop/callback",
-        "scope": "read:recovery read:cycles read:workout read:sleep read:profile read:body_measurement"
-    })
+    return Response(content=OAUTH_CONFIG_JSON, media_type="application/json")
 
 @app.get("/mcp-config")
 def get_mcp_config():
     """Get MCP server configuration in JSON format."""
-    return JSONResponse(content={
-        "mcpServers": {
-            "whoop-mcp": {
-                "command": "python",
-                "args": ["/home/ubuntu/whoop-mcp-server/src/whoop_mcp_server.py"],
-                "env": {
-                    "WHOOP_CLIENT_ID": os.getenv(WHOOP_CLIENT_ID),
-                    "WHOOP_CLIENT_SECRET": os.getenv("WHOOP_CLIENT_SECRET"),
-                    "WHOOP_REDIRECT_URI": "https://mcp.leonhoulier.com/whoop/callback"
-                }
-            }
-        },
-        "oauth": {
-            "whoop": {
-                "clientId": os.getenv(WHOOP_CLIENT_ID),
-                "clientSecret": os.getenv("WHOOP_CLIENT_SECRET"),
-                "authorizationUrl": "https://api.prod.whoop.com/oauth/oauth2/auth",
-                "tokenUrl": "https://api.prod.whoop.com/oauth/oauth2/token",
-                "redirectUri": "https://mcp.leonhoulier.com/whoop/callback",
-                "scope": "read:recovery read:cycles read:workout read:sleep read:profile read:body_measurement"
-            }
-        }
-    })
+    return Response(content=MCP_CONFIG_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    # Every endpoint serves static bytes, so run the C event loop/HTTP parser stack
+    # (uvicorn[standard]) across several worker processes
+    workers = int(os.getenv("OAUTH_CONFIG_WORKERS", max(2, (os.cpu_count() or 2) // 2)))
+    uvicorn.run(
+        "oauth_config_server:app",
+        host="0.0.0.0",
+        port=8002,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        access_log=False
+    )
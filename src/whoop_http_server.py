@@ -4,30 +4,70 @@ HTTP server for Whoop API integration.
 This server exposes HTTP endpoints to query the Whoop API for cycles, recovery, and strain data.
 """
 
+import asyncio
+import math
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
 import logging
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+import httpx
+import orjson
 import uvicorn
-from whoop import WhoopClient
+from whoop import REQUEST_URL, WhoopClient
 
 # Configure logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     stream=sys.stderr
 )
+# httpx logs every request at INFO; keep one line per Whoop API call out of the log
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Authenticate with Whoop before serving, and refuse to start without a client.
+    
+    Also keeps one keep-alive connection pool open for every Whoop API call.
+    """
+    global http_client
+    initialize_whoop_client()
+    if whoop_client is None:
+        raise RuntimeError("Whoop client could not be initialized; check config/.env credentials")
+    async with httpx.AsyncClient(
+        base_url=REQUEST_URL,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60),
+        timeout=10.0,
+    ) as client:
+        http_client = client
+        try:
+            yield
+        finally:
+            http_client = None
+
 # Create FastAPI app
-app = FastAPI(title="Whoop API Server", description="HTTP server for Whoop API integration")
+app = FastAPI(
+    title="Whoop API Server",
+    description="HTTP server for Whoop API integration",
+    lifespan=lifespan
+)
+# Cycle lists are repetitive JSON and compress several-fold; tiny bodies are left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Initialize Whoop client
+# Initialize Whoop client (used for the password login) and the pooled HTTP client
+# the endpoints share for API calls
 whoop_client: Optional[WhoopClient] = None
+http_client: Optional[httpx.AsyncClient] = None
 
 def initialize_whoop_client() -> None:
     """Initialize the Whoop client using environment variables."""
@@ -58,99 +98,190 @@ def initialize_whoop_client() -> None:
     except Exception as e:
         logger.error(f"Authentication failed: {str(e)}")
 
+async def require_client() -> WhoopClient:
+    """Dependency providing the Whoop client authenticated at startup.
+    
+    Async so FastAPI resolves it on the event loop instead of via a threadpool hop.
+    """
+    return whoop_client
+
+@lru_cache(maxsize=32)
+def format_date(day: date) -> str:
+    """Format a date as YYYY-MM-DD; the same handful of days is requested over and over."""
+    return day.isoformat()
+
+# Held while logging in again after a 401, so concurrent requests that all see the
+# expired token trigger a single password login
+relogin_lock = asyncio.Lock()
+
+async def _relogin(client: WhoopClient, rejected_token: str) -> str:
+    """Repeat the password login unless another request already replaced rejected_token.
+    
+    Returns the access token to retry with.
+    """
+    async with relogin_lock:
+        if client.session.token["access_token"] == rejected_token:
+            await asyncio.to_thread(client.authenticate)
+        return client.session.token["access_token"]
+
+async def _request(client: WhoopClient, url_slug: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """GET a Whoop API resource over the shared connection pool.
+    
+    On a 401 the password login is repeated once and the request retried.
+    """
+    access_token = client.session.token["access_token"]
+    response = await http_client.get(
+        url_slug, params=params, headers={"Authorization": f"Bearer {access_token}"}
+    )
+    if response.status_code == 401:
+        access_token = await _relogin(client, access_token)
+        response = await http_client.get(
+            url_slug, params=params, headers={"Authorization": f"Bearer {access_token}"}
+        )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+async def _get_cycles(client: WhoopClient, start_day: date, end_day: date) -> List[Dict[str, Any]]:
+    """Follow next_token through every page of cycles from start_day through end_day."""
+    params: Dict[str, Any] = {
+        "start": f"{format_date(start_day)}T00:00:00Z",
+        "end": f"{format_date(end_day)}T23:59:59Z",
+        "limit": 25,
+    }
+    records: List[Dict[str, Any]] = []
+    while True:
+        page = await _request(client, "v1/cycle", params)
+        records += page["records"]
+        if not page.get("next_token"):
+            return records
+        params["nextToken"] = page["next_token"]
+
+# One shared window of recent cycles: a single upstream fetch serves /cycles/latest,
+# /cycles and /strain/average until it goes stale or a wider range is requested
+CYCLE_WINDOW_DAYS = 30
+CYCLE_WINDOW_MAX_AGE = 60  # seconds
+cycle_window: Dict[str, Any] = {
+    "fetched_at": 0.0, "fetched_on": None, "day": None, "days": 0, "cycles": []
+}
+cycle_window_lock = asyncio.Lock()
+
+async def get_recent_cycles(client: WhoopClient, days: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Get cycles that started within the last `days` days, most recent first.
+    
+    Also returns the time the cycles were fetched when they are a stale window served
+    because Whoop could not be reached, or None when they are fresh.
+    """
+    today = date.today()
+    stale_since = None
+    async with cycle_window_lock:
+        if (cycle_window["day"] != today
+                or days > cycle_window["days"]
+                or time.monotonic() - cycle_window["fetched_at"] > CYCLE_WINDOW_MAX_AGE):
+            window_days = max(days, CYCLE_WINDOW_DAYS)
+            try:
+                cycles = await _get_cycles(client, today - timedelta(days=window_days), today)
+            except Exception as e:
+                # Ride out a Whoop outage on the last window, as long as it covers the range
+                if not cycle_window["cycles"] or days > cycle_window["days"]:
+                    raise
+                logger.warning("Whoop API unavailable (%s), serving cycles fetched %.0fs ago",
+                               e, time.monotonic() - cycle_window["fetched_at"])
+                stale_since = cycle_window["fetched_on"]
+            else:
+                cycle_window.update(
+                    fetched_at=time.monotonic(),
+                    fetched_on=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    day=today, days=window_days, cycles=cycles or []
+                )
+        cycles = cycle_window["cycles"]
+    
+    cutoff = format_date(today - timedelta(days=days))
+    return [cycle for cycle in cycles if cycle.get("start", "")[:10] >= cutoff], stale_since
+
+# Endpoints return orjson-encoded Responses, which serialize the Whoop payloads much
+# faster than the stdlib json encoder
+def json_response(data: Any, stale_since: Optional[str] = None) -> Response:
+    """Serialize directly with orjson (skipping jsonable_encoder) into a JSON response.
+    
+    Data served from a stale cycle window carries a Warning header and the time it was
+    fetched, so clients can tell it may be out of date.
+    """
+    headers = None
+    if stale_since:
+        headers = {"Warning": '110 - "Response is Stale"', "X-Fetched-At": stale_since}
+    return Response(orjson.dumps(data), media_type="application/json", headers=headers)
+
 @app.get("/auth/status")
-def check_auth_status() -> Dict[str, Any]:
+async def check_auth_status(client: WhoopClient = Depends(require_client)) -> Response:
     """Check if we're authenticated with Whoop."""
-    if not whoop_client:
-        return {
-            "authenticated": False,
-            "message": "Not authenticated with Whoop"
-        }
-    
     try:
         # Test authentication by getting profile
-        profile = whoop_client.get_profile()
-        return {
+        profile = await _request(client, "v1/user/profile/basic")
+        return json_response({
             "authenticated": True,
             "message": "Successfully authenticated with Whoop",
             "profile": profile
-        }
+        })
     except Exception as e:
-        return {
+        return json_response({
             "authenticated": False,
             "message": f"Authentication error: {str(e)}"
-        }
+        })
 
 @app.get("/cycles/latest")
-def get_latest_cycle() -> Dict[str, Any]:
+async def get_latest_cycle(client: WhoopClient = Depends(require_client)) -> Response:
     """Get the latest cycle data from Whoop."""
-    if not whoop_client:
-        raise HTTPException(status_code=401, detail="Not authenticated with Whoop")
-    
     try:
-        # Get today's date and yesterday's date
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        # Get cycle collection for the last day
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
-        logger.debug(f"Received cycles response: {cycles}")
+        # Get cycles for the last day
+        cycles, stale_since = await get_recent_cycles(client, 1)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received cycles response: %s", cycles)
         if not cycles:
             raise HTTPException(status_code=404, detail="No cycle data available")
-        return cycles[0]  # Return the most recent cycle
+        return json_response(cycles[0], stale_since)  # Most recent cycle
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting latest cycle: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/strain/average")
-def get_average_strain(days: int = 7) -> Dict[str, Any]:
+async def get_average_strain(days: int = 7, client: WhoopClient = Depends(require_client)) -> Response:
     """Calculate average strain over the specified number of days."""
-    if not whoop_client:
-        raise HTTPException(status_code=401, detail="Not authenticated with Whoop")
-    
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
-        # Get cycle collection
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
+        # Get cycles for the requested range
+        cycles, stale_since = await get_recent_cycles(client, days)
         if not cycles:
             raise HTTPException(status_code=404, detail="No cycle data available")
             
-        # Extract strain values
-        strains = []
-        for cycle in cycles:
-            if cycle.get('score') and cycle['score'].get('strain'):
-                strains.append(cycle['score']['strain'])
+        # Extract strain values in a single pass
+        strains = [cycle['score']['strain'] for cycle in cycles
+                   if cycle.get('score') and cycle['score'].get('strain') is not None]
         
         if not strains:
             raise HTTPException(status_code=404, detail="No strain data available")
             
-        return {
-            "average_strain": sum(strains) / len(strains),
+        return json_response({
+            "average_strain": math.fsum(strains) / len(strains),
             "days_analyzed": days,
             "samples": len(strains)
-        }
+        }, stale_since)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/cycles")
-def get_cycles(limit: int = 10) -> List[Dict[str, Any]]:
+async def get_cycles(limit: int = 10, client: WhoopClient = Depends(require_client)) -> Response:
     """Get multiple cycles from Whoop API."""
-    if not whoop_client:
-        raise HTTPException(status_code=401, detail="Not authenticated with Whoop")
-    
     try:
-        # Calculate date range based on limit
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=limit)).strftime("%Y-%m-%d")
-        
-        # Get cycle collection
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
+        # Get cycles for a date range based on limit
+        cycles, stale_since = await get_recent_cycles(client, limit)
         if not cycles:
             raise HTTPException(status_code=404, detail="No cycle data available")
-        return cycles[:limit]  # Return only the requested number of cycles
+        return json_response(cycles[:limit], stale_since)  # Only the requested number of cycles
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -158,8 +289,7 @@ def main() -> None:
     """Main entry point for the server."""
     try:
         logger.info("Starting Whoop HTTP Server...")
-        initialize_whoop_client()
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
     except Exception as e:
         logger.error(f"Server error: {str(e)}", exc_info=True)
         raise
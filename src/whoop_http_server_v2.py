@@ -7,18 +7,16 @@ It includes MCP-only documentation and OAuth connection instructions.
 """
 
 import os
-from datetime import datetime
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from pathlib import Path
 
+from .docs_page import page_response
+
 app = FastAPI(title="Whoop MCP Server Documentation", version="2.0.0")
 
-@app.get("/", response_class=HTMLResponse)
-async def documentation():
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    html_content = f"""
+# Page body; {today} is filled in with the "Last Updated" date when rendered
+DOCUMENTATION_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -186,9 +184,11 @@ You are a Whoop fitness data assistant. You have access to a Whoop MCP server th
     </div>
 </body>
 </html>
-    """
-    
-    return HTMLResponse(content=html_content)
+"""
+
+@app.get("/", response_class=HTMLResponse)
+async def documentation():
+    return page_response(DOCUMENTATION_HTML)
 
 if __name__ == "__main__":
     import uvicorn
@@ -15,6 +15,7 @@ from typing import Any, Dict, List, Optional, Sequence
 from urllib.parse import urlencode
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
@@ -50,6 +51,14 @@ TOKEN_FILE = Path(__file__).parent.parent / "config" / "tokens.json"
 access_token = None
 refresh_token = None
 
+# One keep-alive connection pool shared by every Whoop API and token request, so tool
+# calls reuse the TCP/TLS connection instead of handshaking each time; closed in main()
+http_client = httpx.AsyncClient(
+    base_url=WHOOP_API_BASE,
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16, keepalive_expiry=60),
+    timeout=30.0,
+)
+
 # Create MCP server instance
 server = Server("whoop-mcp-server")
 
@@ -154,27 +163,26 @@ async def refresh_access_token() -> bool:
         return False
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(WHOOP_TOKEN_URL, data={
-                "grant_type": "refresh_token",
-                "refresh_token": refresh_token,
-                "client_id": CLIENT_ID,
-                "client_secret": CLIENT_SECRET,
-                "scope": "offline"  # Include scope parameter per WHOOP API spec
-            })
-            
-            if response.status_code == 200:
-                data = response.json()
-                                # WHOOP API rotates refresh tokens - use new one if provided
-                new_refresh = data.get("refresh_token", refresh_token)
-                expires_in = data.get("expires_in", 3600)
-                save_tokens(data["access_token"], new_refresh, expires_in)
-                refresh_token = new_refresh  # Update global refresh token
-                logger.info("✅ Access token refreshed successfully (with token rotation)")
-                return True
-            else:
-                logger.error(f"❌ Token refresh failed: {response.status_code}")
-                return False
+        response = await http_client.post(WHOOP_TOKEN_URL, data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": CLIENT_ID,
+            "client_secret": CLIENT_SECRET,
+            "scope": "offline"  # Include scope parameter per WHOOP API spec
+        })
+        
+        if response.status_code == 200:
+            data = response.json()
+                            # WHOOP API rotates refresh tokens - use new one if provided
+            new_refresh = data.get("refresh_token", refresh_token)
+            expires_in = data.get("expires_in", 3600)
+            save_tokens(data["access_token"], new_refresh, expires_in)
+            refresh_token = new_refresh  # Update global refresh token
+            logger.info("✅ Access token refreshed successfully (with token rotation)")
+            return True
+        else:
+            logger.error(f"❌ Token refresh failed: {response.status_code}")
+            return False
     except Exception as e:
         logger.error(f"Error refreshing token: {e}")
         return False
@@ -201,10 +209,10 @@ async def ensure_valid_token() -> bool:
                     
                     # Refresh if expires within 5 minutes (300 seconds)
                     if time_until_expiry < 300:
-                        logger.info(f"Token expires in {int(time_until_expiry)} seconds, refreshing proactively...")
+                        logger.info("Token expires in %d seconds, refreshing proactively...", time_until_expiry)
                         return await refresh_access_token()
     except Exception as e:
-        logger.warning(f"Error checking token expiration: {e}")
+        logger.warning("Error checking token expiration: %s", e)
     
     return True
 
@@ -221,27 +229,26 @@ async def make_whoop_request(endpoint: str, params: Dict = None) -> Any:
     }
     
     url = f"{WHOOP_API_BASE}{endpoint}"
-    logger.info(f"Making request to: {url}")
+    logger.debug("Making request to: %s", url)
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params)
-            
-            if response.status_code == 401:
-                logger.warning("Token expired, attempting refresh...")
-                if await refresh_access_token():
-                    headers["Authorization"] = f"Bearer {access_token}"
-                    response = await client.get(url, headers=headers, params=params)
-                else:
-                    raise Exception("Authentication expired. Please re-authenticate at https://mcp.leonhoulier.com/whoop/reauth")
-            
-            if response.status_code == 200:
-                return response.json()
+        response = await http_client.get(endpoint, headers=headers, params=params)
+        
+        if response.status_code == 401:
+            logger.warning("Token expired, attempting refresh...")
+            if await refresh_access_token():
+                headers["Authorization"] = f"Bearer {access_token}"
+                response = await http_client.get(endpoint, headers=headers, params=params)
             else:
-                logger.error(f"API request failed: {response.status_code} {response.text}")
-                raise Exception(f"API request failed: {response.status_code}")
+                raise Exception("Authentication expired. Please re-authenticate at https://mcp.leonhoulier.com/whoop/reauth")
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error("API request failed: %s %s", response.status_code, response.text)
+            raise Exception(f"API request failed: {response.status_code}")
     except httpx.RequestError as e:
-        logger.error(f"Request error: {e}")
+        logger.error("Request error: %s", e)
         raise Exception(f"Request error: {str(e)}")
 
 @server.list_resources()
@@ -456,276 +463,311 @@ async def handle_list_tools() -> List[Tool]:
         )
     ]
 
+def _dumps(data: Any) -> str:
+    """Pretty-print a tool result as JSON text; orjson is several times faster than json."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+async def _handle_get_recovery_data(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get recovery data including recovery score, HRV, resting heart rate, SpO2, and skin temperature."""
+    start = arguments.get("start")
+    end = arguments.get("end") 
+    limit = arguments.get("limit", 10)
+
+    if not end:
+        end = datetime.now(timezone.utc).isoformat()
+    if not start:
+        start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    data = await make_whoop_request("/recovery", {
+        "start": start,
+        "end": end,
+        "limit": min(limit, 25)
+    })
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_cycles_data(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get physiological cycle data including strain, calories, and heart rate metrics."""
+    start = arguments.get("start")
+    end = arguments.get("end")
+    limit = arguments.get("limit", 10)
+
+    if not end:
+        end = datetime.now(timezone.utc).isoformat()
+    if not start:
+        start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    data = await make_whoop_request("/cycle", {
+        "start": start,
+        "end": end,
+        "limit": min(limit, 25)
+    })
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_latest_cycle(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get the most recent cycle data."""
+    end = datetime.now(timezone.utc).isoformat()
+    start = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+
+    data = await make_whoop_request("/cycle", {
+        "start": start,
+        "end": end,
+        "limit": 1
+    })
+
+    if data and data.get("records"):
+        return [TextContent(
+            type="text",
+            text=_dumps(data["records"][0])
+        )]
+    else:
+        return [TextContent(
+            type="text",
+            text="No cycle data available"
+        )]
+
+async def _handle_get_average_strain(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Calculate average strain over a specified number of days."""
+    days = arguments.get("days", 7)
+    end = datetime.now(timezone.utc).isoformat()
+    start = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+    data = await make_whoop_request("/cycle", {
+        "start": start,
+        "end": end,
+        "limit": 25
+    })
+
+    if not data or not data.get("records"):
+        return [TextContent(
+            type="text",
+            text="No cycle data available"
+        )]
+
+    strains = []
+    for cycle in data["records"]:
+        if cycle.get("score") and cycle["score"].get("strain"):
+            strains.append(cycle["score"]["strain"])
+
+    if not strains:
+        return [TextContent(
+            type="text",
+            text="No strain data available"
+        )]
+
+    result = {
+        "average_strain": round(sum(strains) / len(strains), 2),
+        "days_analyzed": days,
+        "samples": len(strains),
+        "date_range": {
+            "start": start,
+            "end": end
+        }
+    }
+
+    return [TextContent(
+        type="text",
+        text=_dumps(result)
+    )]
+
+async def _handle_check_auth_status(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Check authentication status and get user profile."""
+    if not access_token:
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "authenticated": False,
+                "message": "Not authenticated with Whoop",
+                "instructions": "Please authenticate first"
+            })
+        )]
+
+    try:
+        profile = await make_whoop_request("/user/profile/basic")
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "authenticated": True,
+                "message": "Successfully authenticated with Whoop",
+                "user": profile
+            })
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "authenticated": False,
+                "message": f"Authentication error: {str(e)}",
+                "instructions": "Please re-authenticate"
+            })
+        )]
+
+async def _handle_get_sleep_data(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get sleep data including sleep stages, performance %, quality score, respiratory rate, and efficiency."""
+    start = arguments.get("start")
+    end = arguments.get("end")
+    limit = arguments.get("limit", 10)
+
+    if not end:
+        end = datetime.now(timezone.utc).isoformat()
+    if not start:
+        start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    data = await make_whoop_request("/activity/sleep", {
+        "start": start,
+        "end": end,
+        "limit": min(limit, 25)
+    })
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_sleep_for_cycle(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get sleep data for a specific cycle by cycle ID."""
+    cycle_id = arguments.get("cycle_id")
+
+    if not cycle_id:
+        return [TextContent(
+            type="text",
+            text="Error: cycle_id is required"
+        )]
+
+    data = await make_whoop_request(f"/cycle/{cycle_id}/sleep")
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_latest_sleep(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get the most recent sleep data."""
+    end = datetime.now(timezone.utc).isoformat()
+
+    data = await make_whoop_request("/activity/sleep", {
+        "end": end,
+        "limit": 1
+    })
+
+    if data and data.get("records"):
+        return [TextContent(
+            type="text",
+            text=_dumps(data["records"][0])
+        )]
+    else:
+        return [TextContent(
+            type="text",
+            text="No sleep data available"
+        )]
+
+async def _handle_get_workout_data(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get workout data including sport, strain score, heart rate zones, calories, and GPS data."""
+    start = arguments.get("start")
+    end = arguments.get("end")
+    limit = arguments.get("limit", 10)
+
+    if not end:
+        end = datetime.now(timezone.utc).isoformat()
+    if not start:
+        start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    data = await make_whoop_request("/activity/workout", {
+        "start": start,
+        "end": end,
+        "limit": min(limit, 25)
+    })
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_workout_by_id(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get specific workout by workout ID."""
+    workout_id = arguments.get("workout_id")
+
+    if not workout_id:
+        return [TextContent(
+            type="text",
+            text="Error: workout_id is required"
+        )]
+
+    data = await make_whoop_request(f"/activity/workout/{workout_id}")
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_recent_workouts(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get recent workouts from the last 7 days."""
+    end = datetime.now(timezone.utc).isoformat()
+    start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    data = await make_whoop_request("/activity/workout", {
+        "start": start,
+        "end": end,
+        "limit": 25
+    })
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+async def _handle_get_body_measurements(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Get user body measurements including height, weight, and max heart rate."""
+    data = await make_whoop_request("/user/measurement/body")
+
+    return [TextContent(
+        type="text",
+        text=_dumps(data)
+    )]
+
+# Tool name -> handler, so dispatch is a single dict lookup instead of an if/elif chain
+TOOL_HANDLERS = {
+    "get_recovery_data": _handle_get_recovery_data,
+    "get_cycles_data": _handle_get_cycles_data,
+    "get_latest_cycle": _handle_get_latest_cycle,
+    "get_average_strain": _handle_get_average_strain,
+    "check_auth_status": _handle_check_auth_status,
+    "get_sleep_data": _handle_get_sleep_data,
+    "get_sleep_for_cycle": _handle_get_sleep_for_cycle,
+    "get_latest_sleep": _handle_get_latest_sleep,
+    "get_workout_data": _handle_get_workout_data,
+    "get_workout_by_id": _handle_get_workout_by_id,
+    "get_recent_workouts": _handle_get_recent_workouts,
+    "get_body_measurements": _handle_get_body_measurements,
+}
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls."""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(
+            type="text",
+            text=f"Unknown tool: {name}"
+        )]
+    
     try:
-        if name == "get_recovery_data":
-            start = arguments.get("start")
-            end = arguments.get("end") 
-            limit = arguments.get("limit", 10)
-            
-            if not end:
-                end = datetime.now(timezone.utc).isoformat()
-            if not start:
-                start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            
-            data = await make_whoop_request("/recovery", {
-                "start": start,
-                "end": end,
-                "limit": min(limit, 25)
-            })
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_cycles_data":
-            start = arguments.get("start")
-            end = arguments.get("end")
-            limit = arguments.get("limit", 10)
-            
-            if not end:
-                end = datetime.now(timezone.utc).isoformat()
-            if not start:
-                start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            
-            data = await make_whoop_request("/cycle", {
-                "start": start,
-                "end": end,
-                "limit": min(limit, 25)
-            })
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_latest_cycle":
-            end = datetime.now(timezone.utc).isoformat()
-            start = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
-            
-            data = await make_whoop_request("/cycle", {
-                "start": start,
-                "end": end,
-                "limit": 1
-            })
-            
-            if data and data.get("records"):
-                return [TextContent(
-                    type="text",
-                    text=json.dumps(data["records"][0], indent=2)
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text="No cycle data available"
-                )]
-                
-        elif name == "get_average_strain":
-            days = arguments.get("days", 7)
-            end = datetime.now(timezone.utc).isoformat()
-            start = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-            
-            data = await make_whoop_request("/cycle", {
-                "start": start,
-                "end": end,
-                "limit": 25
-            })
-            
-            if not data or not data.get("records"):
-                return [TextContent(
-                    type="text",
-                    text="No cycle data available"
-                )]
-            
-            strains = []
-            for cycle in data["records"]:
-                if cycle.get("score") and cycle["score"].get("strain"):
-                    strains.append(cycle["score"]["strain"])
-            
-            if not strains:
-                return [TextContent(
-                    type="text",
-                    text="No strain data available"
-                )]
-            
-            result = {
-                "average_strain": round(sum(strains) / len(strains), 2),
-                "days_analyzed": days,
-                "samples": len(strains),
-                "date_range": {
-                    "start": start,
-                    "end": end
-                }
-            }
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-            
-        elif name == "check_auth_status":
-            if not access_token:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "authenticated": False,
-                        "message": "Not authenticated with Whoop",
-                        "instructions": "Please authenticate first"
-                    }, indent=2)
-                )]
-            
-            try:
-                profile = await make_whoop_request("/user/profile/basic")
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "authenticated": True,
-                        "message": "Successfully authenticated with Whoop",
-                        "user": profile
-                    }, indent=2)
-                )]
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "authenticated": False,
-                        "message": f"Authentication error: {str(e)}",
-                        "instructions": "Please re-authenticate"
-                    }, indent=2)
-                )]
-        
-        elif name == "get_sleep_data":
-            start = arguments.get("start")
-            end = arguments.get("end")
-            limit = arguments.get("limit", 10)
-            
-            if not end:
-                end = datetime.now(timezone.utc).isoformat()
-            if not start:
-                start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            
-            data = await make_whoop_request("/activity/sleep", {
-                "start": start,
-                "end": end,
-                "limit": min(limit, 25)
-            })
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_sleep_for_cycle":
-            cycle_id = arguments.get("cycle_id")
-            
-            if not cycle_id:
-                return [TextContent(
-                    type="text",
-                    text="Error: cycle_id is required"
-                )]
-            
-            data = await make_whoop_request(f"/cycle/{cycle_id}/sleep")
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_latest_sleep":
-            end = datetime.now(timezone.utc).isoformat()
-            
-            data = await make_whoop_request("/activity/sleep", {
-                "end": end,
-                "limit": 1
-            })
-            
-            if data and data.get("records"):
-                return [TextContent(
-                    type="text",
-                    text=json.dumps(data["records"][0], indent=2)
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text="No sleep data available"
-                )]
-        
-        elif name == "get_workout_data":
-            start = arguments.get("start")
-            end = arguments.get("end")
-            limit = arguments.get("limit", 10)
-            
-            if not end:
-                end = datetime.now(timezone.utc).isoformat()
-            if not start:
-                start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            
-            data = await make_whoop_request("/activity/workout", {
-                "start": start,
-                "end": end,
-                "limit": min(limit, 25)
-            })
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_workout_by_id":
-            workout_id = arguments.get("workout_id")
-            
-            if not workout_id:
-                return [TextContent(
-                    type="text",
-                    text="Error: workout_id is required"
-                )]
-            
-            data = await make_whoop_request(f"/activity/workout/{workout_id}")
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-            
-        elif name == "get_recent_workouts":
-            end = datetime.now(timezone.utc).isoformat()
-            start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            
-            data = await make_whoop_request("/activity/workout", {
-                "start": start,
-                "end": end,
-                "limit": 25
-            })
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-        
-        elif name == "get_body_measurements":
-            data = await make_whoop_request("/user/measurement/body")
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-        
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
-            
+        return await handler(arguments)
     except Exception as e:
-        logger.error(f"Error in tool {name}: {e}")
+        logger.error("Error in tool %s: %s", name, e)
         return [TextContent(
             type="text",
             text=f"Error: {str(e)}"
         )]
 
+
 async def main():
     """Main entry point for the MCP server."""
     logger.info("🚀 Starting Whoop MCP Server with OAuth support...")
@@ -740,19 +782,22 @@ async def main():
         logger.info("⚠️  No access token found. Authentication required.")
     
     # Run the server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="whoop-mcp-server",
-                server_version="2.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities=None
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="whoop-mcp-server",
+                    server_version="2.0.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=None,
+                        experimental_capabilities=None
+                    )
                 )
             )
-        )
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,27 +1,25 @@
 #!/usr/bin/env python3
-import logging, os, sys
+import logging, os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from pathlib import Path
 from typing import Any
+import orjson
 import uvicorn
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse, Response
+from starlette.responses import Response
 from starlette.routing import Route, Mount
 from starlette.middleware import Middleware
 from starlette.middleware.authentication import AuthenticationMiddleware
 
-CURRENT_DIR = Path(__file__).parent
-if str(CURRENT_DIR) not in sys.path:
-    sys.path.insert(0, str(CURRENT_DIR))
-
-from whoop_mcp_server import server, load_config, load_tokens
+from .whoop_mcp_server import server, load_config, load_tokens
+from mcp.server import NotificationOptions
 from mcp.server.sse import SseServerTransport
 from mcp.server.models import InitializationOptions
 from mcp.server.auth.routes import create_auth_routes
 from mcp.server.auth.middleware.bearer_auth import BearerAuthBackend, RequireAuthMiddleware
 from mcp.server.auth.settings import ClientRegistrationOptions
 from mcp.server.auth.provider import ProviderTokenVerifier
-from whoop_oauth_provider import provider
+from .whoop_oauth_provider import provider
 from pydantic import AnyHttpUrl
 
 logging.basicConfig(level=logging.INFO)
@@ -29,39 +27,49 @@ logger = logging.getLogger("whoop-mcp-sse")
 
 sse = SseServerTransport("/messages/")
 
+def json_response(data: Any, status_code: int = 200) -> Response:
+    """Build a JSON response with orjson; naive datetimes are encoded as UTC."""
+    return Response(
+        orjson.dumps(data, option=orjson.OPT_NAIVE_UTC),
+        media_type="application/json",
+        status_code=status_code
+    )
+
+# Capabilities only depend on the handlers registered at import time, so build the
+# initialize payload once instead of on every SSE connection
+INIT_OPTIONS = InitializationOptions(
+    server_name="whoop-mcp-sse",
+    server_version="2.0.0",
+    capabilities=server.get_capabilities(notification_options=NotificationOptions(), experimental_capabilities={}),
+)
+
 async def handle_sse(request):
     async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="whoop-mcp-sse",
-                server_version="2.0.0",
-                capabilities=server.get_capabilities(notification_options=None, experimental_capabilities={}),
-            ),
-        )
+        await server.run(read_stream, write_stream, INIT_OPTIONS)
     return Response()
 
+# Constant error body for callbacks without a code, encoded once
+MISSING_CODE_BODY = orjson.dumps(
+    {"error": "missing_code", "error_description": "Authorization code not provided"}
+)
+
 async def handle_callback(request):
     """Handle OAuth callback from Whoop with authorization code"""
     try:
         # Get query parameters
-        query_params = dict(request.query_params)
+        query_params = request.query_params
         code = query_params.get("code")
         state = query_params.get("state")
         scope = query_params.get("scope", "")
         
         if not code:
-            return JSONResponse(
-                {"error": "missing_code", "error_description": "Authorization code not provided"},
-                status_code=400
-            )
+            return Response(MISSING_CODE_BODY, media_type="application/json", status_code=400)
         
         logger.info(f"OAuth callback received - code: {code[:10]}..., state: {state}, scope: {scope}")
         
         # TODO: Exchange authorization code for access token using Whoop API
         # For now, return success message
-        return JSONResponse({
+        return json_response({
             "status": "success",
             "message": "Authorization code received successfully",
             "code_received": code[:10] + "...",
@@ -71,13 +79,23 @@ async def handle_callback(request):
         
     except Exception as e:
         logger.error(f"Error in OAuth callback: {e}")
-        return JSONResponse(
+        return json_response(
             {"error": "callback_error", "error_description": str(e)},
             status_code=500
         )
 
+@asynccontextmanager
+async def lifespan(_: Starlette):
+    """Load the OAuth stores on startup; flush pending writes and close clients on shutdown."""
+    await provider.initialize()
+    try:
+        yield
+    finally:
+        await provider.flush()
+        await provider.close()
+
 async def health(_: Any):
-    return JSONResponse({"status": "ok", "time": datetime.utcnow().isoformat()})
+    return json_response({"status": "ok", "time": datetime.utcnow()})
 
 def main():
     load_config()
@@ -105,31 +123,26 @@ def main():
     token_verifier = ProviderTokenVerifier(provider)
     auth_backend = BearerAuthBackend(token_verifier)
     
-    # Create protected SSE handler with auth middleware
-    protected_sse = AuthenticationMiddleware(
-        RequireAuthMiddleware(handle_sse, required_scopes=["read:recovery"]),
-        backend=auth_backend
-    )
-    
-    # Create protected messages handler with auth middleware
-    protected_messages = AuthenticationMiddleware(
-        RequireAuthMiddleware(sse.handle_post_message, required_scopes=["read:recovery"]),
-        backend=auth_backend
-    )
+    # One auth stack shared by every protected MCP route instead of a copy per endpoint
+    protected_middleware = [
+        Middleware(AuthenticationMiddleware, backend=auth_backend),
+        Middleware(RequireAuthMiddleware, required_scopes=["read:recovery"]),
+    ]
     
     app = Starlette(
         routes=[
             # OAuth routes
             *oauth_routes,
             
-            # Protected MCP routes
-            Route("/sse", endpoint=protected_sse, methods=["GET"]),
-            Mount("/messages/", app=protected_messages),
-            
             # Public health check
             Route("/callback", endpoint=handle_callback, methods=["GET"]),
             Route("/health", endpoint=health, methods=["GET"]),
-        ]
+            
+            # Protected MCP routes
+            Route("/sse", endpoint=handle_sse, methods=["GET"], middleware=protected_middleware),
+            Mount("/messages/", app=sse.handle_post_message, middleware=protected_middleware),
+        ],
+        lifespan=lifespan,
     )
     
     port = int(os.getenv("MCP_SSE_PORT", "8003"))
@@ -137,7 +150,7 @@ def main():
     logger.info(f"OAuth issuer URL: {issuer_url}")
     logger.info(f"OAuth metadata: {issuer_url}/.well-known/oauth-authorization-server")
     
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools")
 
 if __name__ == "__main__":
     main()
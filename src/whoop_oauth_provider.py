@@ -6,16 +6,23 @@ This module implements the OAuthAuthorizationServerProvider interface for Whoop
 It handles per-session OAuth tokens and integrates with the existing Whoop OAuth flow.
 """
 
-import json
+import asyncio
+import base64
+import hashlib
+import heapq
 import logging
 import os
-import secrets
+import sys
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 
+import httpx
+import orjson
 from mcp.server.auth.provider import (
     OAuthAuthorizationServerProvider,
     AuthorizationCode,
@@ -27,7 +34,6 @@ from mcp.server.auth.provider import (
     RegistrationError,
 )
 from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
-from pydantic import AnyUrl
 
 logger = logging.getLogger("whoop-oauth-provider")
 
@@ -37,12 +43,98 @@ WHOOP_CLIENT_SECRET = os.getenv("WHOOP_CLIENT_SECRET")
 WHOOP_REDIRECT_URI = os.getenv("WHOOP_REDIRECT_URI")
 WHOOP_EMAIL = os.getenv("WHOOP_EMAIL")
 WHOOP_PASSWORD = os.getenv("WHOOP_PASSWORD")
+WHOOP_API_BASE = "https://api.prod.whoop.com"
 
 # Storage paths
 STORAGE_DIR = Path(__file__).parent.parent / "storage"
 CLIENTS_FILE = STORAGE_DIR / "oauth_clients.json"
 TOKENS_FILE = STORAGE_DIR / "oauth_tokens.json"
 AUTH_CODES_FILE = STORAGE_DIR / "oauth_auth_codes.json"
+REFRESH_TOKENS_FILE = STORAGE_DIR / "oauth_refresh_tokens.json"
+
+# Each store is a compacted JSON snapshot plus an append-only JSONL journal of
+# changes since that snapshot: store name -> (snapshot file, journal file)
+STORE_FILES = {
+    "clients": (CLIENTS_FILE, CLIENTS_FILE.with_suffix(".jsonl")),
+    "tokens": (TOKENS_FILE, TOKENS_FILE.with_suffix(".jsonl")),
+    "auth_codes": (AUTH_CODES_FILE, AUTH_CODES_FILE.with_suffix(".jsonl")),
+    "refresh_tokens": (REFRESH_TOKENS_FILE, REFRESH_TOKENS_FILE.with_suffix(".jsonl")),
+}
+
+# Debounce window for coalescing persistence writes
+FLUSH_DELAY = 0.05
+
+# Journal entries tolerated (beyond the live entry count) before compacting
+COMPACT_MIN_OPS = 1000
+
+# Maximum time between sweeps of expired tokens and auth codes
+SWEEP_INTERVAL = 60
+
+# Recently validated access tokens are trusted for this long without re-checking
+TOKEN_LRU_TTL = 30
+TOKEN_LRU_SIZE = 4096
+
+# Digests of recently revoked tokens kept to reject replays without a store lookup
+REVOKED_LRU_SIZE = 10000
+
+
+# Expiry checks only need second-level accuracy, so use the kernel's coarse
+# realtime clock where available (cheaper to read than the precise one)
+if hasattr(time, "CLOCK_REALTIME_COARSE"):
+    def _now() -> float:
+        return time.clock_gettime(time.CLOCK_REALTIME_COARSE)
+else:
+    _now = time.time
+
+
+def _token_digest(token: str) -> bytes:
+    """Compact fixed-size key for a token string."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _encode(model: Any) -> bytes:
+    """JSON-encode a stored model."""
+    return orjson.dumps(model.model_dump(mode="json"))
+
+
+def _refresh_key(refresh_token: str) -> str:
+    """Store key for a refresh token, so the raw token is never used as a key on disk."""
+    return _token_digest(refresh_token).hex()
+
+
+class _TokenPool:
+    """Hands out random token bytes from a buffer refilled by one os.urandom call.
+    
+    Amortizes the getrandom syscall across many tokens. The buffer is discarded
+    after a fork so parent and child never hand out the same bytes.
+    """
+    
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._lock = threading.Lock()
+        self._refill()
+    
+    def _refill(self):
+        self._buf = os.urandom(self._size)
+        self._pos = 0
+        self._pid = os.getpid()
+    
+    def take(self, nbytes: int) -> bytes:
+        """Return nbytes of unused random bytes."""
+        with self._lock:
+            if self._pos + nbytes > self._size or self._pid != os.getpid():
+                self._refill()
+            chunk = self._buf[self._pos:self._pos + nbytes]
+            self._pos += nbytes
+            return chunk
+    
+    def urlsafe(self, nbytes: int = 32) -> str:
+        """Equivalent of secrets.token_urlsafe(nbytes)."""
+        return base64.urlsafe_b64encode(self.take(nbytes)).rstrip(b"=").decode("ascii")
+    
+    def hex(self, nbytes: int) -> str:
+        """Equivalent of secrets.token_hex(nbytes)."""
+        return self.take(nbytes).hex()
 
 
 class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, RefreshToken, AccessToken]):
@@ -60,7 +152,51 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         self._clients: Dict[str, OAuthClientInformationFull] = {}
         self._tokens: Dict[str, AccessToken] = {}
         self._auth_codes: Dict[str, AuthorizationCode] = {}
+        self._refresh_tokens: Dict[str, RefreshToken] = {}  # _refresh_key(token) -> refresh token
         self._whoop_tokens: Dict[str, Dict[str, Any]] = {}  # session_id -> whoop_token_data
+        self._stores = {
+            "clients": self._clients,
+            "tokens": self._tokens,
+            "auth_codes": self._auth_codes,
+            "refresh_tokens": self._refresh_tokens,
+        }
+        
+        # Pending writes: encoded journal records per store, flushed in batches
+        self._pending: Dict[str, list[bytes]] = {name: [] for name in STORE_FILES}
+        self._journal_ops: Dict[str, int] = {name: 0 for name in STORE_FILES}
+        # Encoded JSON of every stored entry, kept in step with the stores so
+        # compaction never has to re-serialize models
+        self._encoded: Dict[str, Dict[str, bytes]] = {name: {} for name in STORE_FILES}
+        self._dirty: set[str] = set()
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        # Serializes journal writes so records reach disk in the order they were made
+        self._flush_lock = asyncio.Lock()
+        
+        # Min-heaps of (expires_at, key) so expired entries can be evicted without a scan
+        self._expiry: Dict[str, list[tuple[float, str]]] = {"tokens": [], "auth_codes": [], "refresh_tokens": []}
+        
+        # token -> (access token, time until which it is known valid), most recent last
+        self._token_lru: OrderedDict[str, tuple[AccessToken, float]] = OrderedDict()
+        self._revoked_lru: OrderedDict[bytes, None] = OrderedDict()
+        
+        self._rng = _TokenPool()
+        
+        # One shared scope list per distinct scope set, reused by every token granting it
+        self._scope_interner: Dict[tuple[str, ...], list[str]] = {}
+        
+        # Persisted data is read by load()/initialize(), not at import time
+        self._loaded = False
+        
+        # Keep-alive client for Whoop OAuth calls, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def load(self):
+        """Load persisted stores from disk; does nothing after the first call."""
+        if self._loaded:
+            return
+        self._loaded = True
         
         # Ensure storage directory exists
         STORAGE_DIR.mkdir(exist_ok=True)
@@ -69,104 +205,269 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         self._load_clients()
         self._load_tokens()
         self._load_auth_codes()
+        self._load_refresh_tokens()
         
         # Load existing Whoop tokens if available
         self._load_whoop_tokens()
+        
+        for name, store in self._stores.items():
+            self._encoded[name] = {key: _encode(value) for key, value in store.items()}
+        
+        for name, heap in self._expiry.items():
+            for entry in self._stores[name].values():
+                self._intern_grant(entry)
+            heap.extend((entry.expires_at, key) for key, entry in self._stores[name].items() if entry.expires_at)
+            heapq.heapify(heap)
+    
+    async def initialize(self):
+        """Load persisted stores without blocking the event loop (server startup hook)."""
+        await asyncio.to_thread(self.load)
+        # Sweep entries that expired while the server was down, then every SWEEP_INTERVAL
+        self._start_flush_loop(asyncio.get_running_loop())
+        self._flush_event.set()
+    
+    def _load_store(self, name: str) -> Dict[str, Any]:
+        """Read a store's snapshot and replay its journal on top of it."""
+        snapshot_file, journal_file = STORE_FILES[name]
+        data: Dict[str, Any] = {}
+        if snapshot_file.exists():
+            data = orjson.loads(snapshot_file.read_bytes())
+        if journal_file.exists():
+            for line in journal_file.read_bytes().splitlines():
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    logger.warning(f"Skipping corrupt {name} journal entry")
+                    continue
+                if record["op"] == "put":
+                    data[record["k"]] = record["v"]
+                else:
+                    data.pop(record["k"], None)
+                self._journal_ops[name] += 1
+        return data
     
     def _load_clients(self):
         """Load client registrations from file."""
-        if CLIENTS_FILE.exists():
-            try:
-                with open(CLIENTS_FILE, "r") as f:
-                    data = json.load(f)
-                    for client_id, client_data in data.items():
-                        self._clients[client_id] = OAuthClientInformationFull(**client_data)
-                logger.info(f"Loaded {len(self._clients)} clients from storage")
-            except Exception as e:
-                logger.error(f"Failed to load clients: {e}")
-    
-    def _save_clients(self):
-        """Save client registrations to file."""
         try:
-            # Convert AnyUrl objects to strings for JSON serialization
-            data = {}
-            for cid, client in self._clients.items():
-                client_dict = client.model_dump()
-                # Convert AnyUrl objects to strings
-                for key, value in client_dict.items():
-                    if isinstance(value, AnyUrl):
-                        client_dict[key] = str(value)
-                    elif isinstance(value, list) and value and isinstance(value[0], AnyUrl):
-                        client_dict[key] = [str(v) for v in value]
-                data[cid] = client_dict
-            with open(CLIENTS_FILE, "w") as f:
-                json.dump(data, f, indent=2)
+            for client_id, client_data in self._load_store("clients").items():
+                self._clients[client_id] = OAuthClientInformationFull.model_validate(client_data)
+            logger.info(f"Loaded {len(self._clients)} clients from storage")
         except Exception as e:
-            logger.error(f"Failed to save clients: {e}")
+            logger.error(f"Failed to load clients: {e}")
     
     def _load_tokens(self):
         """Load access tokens from file."""
-        if TOKENS_FILE.exists():
-            try:
-                with open(TOKENS_FILE, "r") as f:
-                    data = json.load(f)
-                    for token, token_data in data.items():
-                        self._tokens[token] = AccessToken(**token_data)
-                logger.info(f"Loaded {len(self._tokens)} tokens from storage")
-            except Exception as e:
-                logger.error(f"Failed to load tokens: {e}")
-    
-    def _save_tokens(self):
-        """Save access tokens to file."""
         try:
-            data = {token: access_token.model_dump() for token, access_token in self._tokens.items()}
-            with open(TOKENS_FILE, "w") as f:
-                json.dump(data, f, indent=2)
+            for token, token_data in self._load_store("tokens").items():
+                self._tokens[token] = AccessToken.model_validate(token_data)
+            logger.info(f"Loaded {len(self._tokens)} tokens from storage")
         except Exception as e:
-            logger.error(f"Failed to save tokens: {e}")
+            logger.error(f"Failed to load tokens: {e}")
     
     def _load_auth_codes(self):
         """Load authorization codes from file."""
-        if AUTH_CODES_FILE.exists():
-            try:
-                with open(AUTH_CODES_FILE, "r") as f:
-                    data = json.load(f)
-                    for code, code_data in data.items():
-                        # Convert string URLs back to AnyUrl
-                        if 'redirect_uri' in code_data:
-                            code_data['redirect_uri'] = AnyUrl(code_data['redirect_uri'])
-                        self._auth_codes[code] = AuthorizationCode(**code_data)
-                logger.info(f"Loaded {len(self._auth_codes)} auth codes from storage")
-            except Exception as e:
-                logger.error(f"Failed to load auth codes: {e}")
+        try:
+            for code, code_data in self._load_store("auth_codes").items():
+                self._auth_codes[code] = AuthorizationCode.model_validate(code_data)
+            logger.info(f"Loaded {len(self._auth_codes)} auth codes from storage")
+        except Exception as e:
+            logger.error(f"Failed to load auth codes: {e}")
     
-    def _save_auth_codes(self):
-        """Save authorization codes to file."""
+    def _load_refresh_tokens(self):
+        """Load refresh tokens from file."""
         try:
-            data = {}
-            for code, auth_code in self._auth_codes.items():
-                auth_dict = auth_code.model_dump()
-                # Convert AnyUrl to string
-                if 'redirect_uri' in auth_dict and isinstance(auth_dict['redirect_uri'], AnyUrl):
-                    auth_dict['redirect_uri'] = str(auth_dict['redirect_uri'])
-                data[code] = auth_dict
-            with open(AUTH_CODES_FILE, "w") as f:
-                json.dump(data, f, indent=2)
+            for key, token_data in self._load_store("refresh_tokens").items():
+                self._refresh_tokens[key] = RefreshToken.model_validate(token_data)
+            logger.info(f"Loaded {len(self._refresh_tokens)} refresh tokens from storage")
         except Exception as e:
-            logger.error(f"Failed to save auth codes: {e}")
+            logger.error(f"Failed to load refresh tokens: {e}")
+    
+    def _intern_grant(self, grant: Any):
+        """Deduplicate a token's or auth code's client_id and scopes in place.
+        
+        Pydantic copies lists on validation, so the shared list is assigned afterwards.
+        Scope lists are never mutated once issued.
+        """
+        grant.client_id = sys.intern(grant.client_id)
+        grant.scopes = self._scope_interner.setdefault(tuple(grant.scopes), grant.scopes)
+    
+    def _put(self, name: str, key: str, value: Any):
+        """Store an entry and journal the change."""
+        self._stores[name][key] = value
+        if name in self._expiry:
+            self._intern_grant(value)
+            if value.expires_at:
+                heapq.heappush(self._expiry[name], (value.expires_at, key))
+        encoded = _encode(value)
+        self._encoded[name][key] = encoded
+        self._pending[name].append(b'{"op":"put","k":' + orjson.dumps(key) + b',"v":' + encoded + b"}\n")
+        self._mark_dirty(name)
+    
+    def _delete(self, name: str, key: str):
+        """Remove an entry and journal the change."""
+        del self._stores[name][key]
+        del self._encoded[name][key]
+        self._pending[name].append(orjson.dumps({"op": "del", "k": key}) + b"\n")
+        self._mark_dirty(name)
+    
+    def _mark_dirty(self, store: str):
+        """Mark a store as changed and wake the flush loop.
+        
+        Without a running event loop (e.g. scripts) the store is written immediately.
+        """
+        self._dirty.add(store)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_snapshot(self._take_snapshot())
+            return
+        self._start_flush_loop(loop)
+        self._flush_event.set()
+    
+    def _start_flush_loop(self, loop: asyncio.AbstractEventLoop):
+        """Start the background flush/sweep task if it is not already running."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_event = asyncio.Event()
+            self._flush_task = loop.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        """Coalesce bursts of mutations into one write per store per flush window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), SWEEP_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                await asyncio.sleep(FLUSH_DELAY)
+            self._sweep_expired()
+            self._flush_event.clear()
+            if self._dirty:
+                async with self._flush_lock:
+                    await loop.run_in_executor(None, self._write_snapshot, self._take_snapshot())
+    
+    def _sweep_expired(self):
+        """Evict expired tokens and auth codes from the front of the expiry heaps."""
+        now = _now()
+        for name, heap in self._expiry.items():
+            store = self._stores[name]
+            while heap and heap[0][0] < now:
+                expires_at, key = heapq.heappop(heap)
+                entry = store.get(key)
+                # Skip heap entries for keys already deleted or re-issued
+                if entry is not None and entry.expires_at == expires_at:
+                    self._delete(name, key)
+    
+    def _take_snapshot(self) -> Dict[str, tuple[list[bytes], Optional[Dict[str, bytes]]]]:
+        """Collect pending journal records, or a full copy of stores due for compaction."""
+        snapshot = {}
+        for name in self._dirty:
+            records, self._pending[name] = self._pending[name], []
+            self._journal_ops[name] += len(records)
+            store = self._stores[name]
+            if self._journal_ops[name] > max(COMPACT_MIN_OPS, len(store)):
+                # The copy already reflects the pending records
+                self._journal_ops[name] = 0
+                snapshot[name] = ([], dict(self._encoded[name]))
+            else:
+                snapshot[name] = (records, None)
+        self._dirty.clear()
+        return snapshot
+    
+    def _write_snapshot(self, snapshot: Dict[str, tuple[list[bytes], Optional[Dict[str, bytes]]]]):
+        """Append journal records, or compact a store into a fresh snapshot file."""
+        with self._write_lock:
+            for name, (records, full) in snapshot.items():
+                snapshot_file, journal_file = STORE_FILES[name]
+                try:
+                    if full is not None:
+                        tmp_file = snapshot_file.with_suffix(".tmp")
+                        # A leftover tmp file from a crash would keep its old mode
+                        tmp_file.unlink(missing_ok=True)
+                        self._write_json_object(tmp_file, full)
+                        os.replace(tmp_file, snapshot_file)
+                        dir_fd = os.open(snapshot_file.parent, os.O_RDONLY)
+                        try:
+                            os.fsync(dir_fd)
+                        finally:
+                            os.close(dir_fd)
+                        # The snapshot is durable before the journal is emptied; replaying
+                        # the old journal over it is harmless, so a crash before this
+                        # truncate loses nothing
+                        os.close(os.open(journal_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+                    elif records:
+                        fd = os.open(journal_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                        try:
+                            os.write(fd, b"".join(records))
+                        finally:
+                            os.close(fd)
+                except Exception as e:
+                    logger.error(f"Failed to save {name}: {e}")
+    
+    @staticmethod
+    def _write_json_object(path: Path, entries: Dict[str, bytes]):
+        """Stream pre-encoded entries to path as a JSON object, one record at a time.
+        
+        Avoids materializing a copy of the whole store before writing. The file is
+        owner-only like the journals (it holds tokens and client secrets) and is synced
+        to disk before returning, so it can safely replace the old snapshot.
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"{")
+            separator = b"\n"
+            for key, value in entries.items():
+                f.write(separator)
+                f.write(orjson.dumps(key))
+                f.write(b": ")
+                f.write(value)
+                separator = b",\n"
+            f.write(b"\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    async def flush(self):
+        """Stop the flush loop and write any pending changes (call on shutdown)."""
+        # Holding the lock waits out an in-flight write, so cancelling cannot
+        # leave it racing (and reordering records with) the final one
+        async with self._flush_lock:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+            if self._dirty:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write_snapshot, self._take_snapshot()
+                )
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared pooled client for Whoop OAuth requests; reuses TLS connections."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=WHOOP_API_BASE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(10.0),
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the shared HTTP client (call on shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     def _load_whoop_tokens(self):
         """Load existing Whoop tokens if available."""
         tokens_path = Path(__file__).parent.parent / "config" / "tokens.json"
         if tokens_path.exists():
             try:
-                with open(tokens_path, "r") as f:
-                    whoop_data = json.load(f)
-                    # Create a default session for existing tokens
-                    if whoop_data.get("access_token"):
-                        session_id = "default_session"
-                        self._whoop_tokens[session_id] = whoop_data
-                        logger.info("Loaded existing Whoop tokens for default session")
+                whoop_data = orjson.loads(tokens_path.read_bytes())
+                # Create a default session for existing tokens
+                if whoop_data.get("access_token"):
+                    session_id = "default_session"
+                    self._whoop_tokens[session_id] = whoop_data
+                    logger.info("Loaded existing Whoop tokens for default session")
             except Exception as e:
                 logger.error(f"Failed to load Whoop tokens: {e}")
     
@@ -181,26 +482,25 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             raise RegistrationError("invalid_redirect_uri", "At least one redirect URI is required")
         
         # Generate client ID and secret
-        client_info.client_id = secrets.token_urlsafe(32)
-        client_info.client_secret = secrets.token_urlsafe(32)
+        client_info.client_id = self._rng.urlsafe()
+        client_info.client_secret = self._rng.urlsafe()
         client_info.client_id_issued_at = int(time.time())
         
         # Store client
-        self._clients[client_info.client_id] = client_info
-        self._save_clients()
+        self._put("clients", client_info.client_id, client_info)
         
         logger.info(f"Registered new client: {client_info.client_id}")
     
     async def authorize(self, client: OAuthClientInformationFull, params: AuthorizationParams) -> str:
         """Handle authorization request and redirect to Whoop OAuth."""
         # Generate authorization code
-        auth_code = secrets.token_urlsafe(32)
+        auth_code = self._rng.urlsafe()
         
         # Store authorization code
         authorization_code = AuthorizationCode(
             code=auth_code,
             scopes=params.scopes or [],
-            expires_at=time.time() + 600,  # 10 minutes
+            expires_at=_now() + 600,  # 10 minutes
             client_id=client.client_id,
             code_challenge=params.code_challenge,
             redirect_uri=params.redirect_uri,
@@ -208,8 +508,7 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             resource=params.resource
         )
         
-        self._auth_codes[auth_code] = authorization_code
-        self._save_auth_codes()
+        self._put("auth_codes", auth_code, authorization_code)
         
         # Build Whoop OAuth URL with CORRECT endpoint
         whoop_params = {
@@ -217,11 +516,11 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             "client_id": WHOOP_CLIENT_ID,
             "redirect_uri": WHOOP_REDIRECT_URI,
             "scope": "read:recovery read:workout read:profile",
-            "state": params.state or secrets.token_urlsafe(16)
+            "state": params.state or self._rng.urlsafe(16)
         }
         
         # Use the CORRECT Whoop OAuth endpoint: /oauth/oauth2/auth (not authorize)
-        whoop_auth_url = f"https://api.prod.whoop.com/oauth/oauth2/auth?{urlencode(whoop_params)}"
+        whoop_auth_url = f"{WHOOP_API_BASE}/oauth/oauth2/auth?{urlencode(whoop_params)}"
         
         logger.info(f"Generated auth code {auth_code} for client {client.client_id}")
         logger.info(f"Redirecting to Whoop OAuth: {whoop_auth_url}")
@@ -237,9 +536,8 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             return None
         
         # Check if expired
-        if time.time() > code.expires_at:
-            del self._auth_codes[authorization_code]
-            self._save_auth_codes()
+        if _now() > code.expires_at:
+            self._delete("auth_codes", authorization_code)
             return None
         
         return code
@@ -250,12 +548,12 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         """Exchange authorization code for access token."""
         # Remove used authorization code
         if authorization_code.code in self._auth_codes:
-            del self._auth_codes[authorization_code.code]
-            self._save_auth_codes()
+            self._delete("auth_codes", authorization_code.code)
         
         # For now, use existing Whoop tokens or create a session-specific token
-        # In a real implementation, you'd exchange the Whoop auth code for a token here
-        session_id = f"session_{secrets.token_hex(8)}"
+        # In a real implementation, you'd exchange the Whoop auth code for a token here,
+        # via self.http.post("/oauth/oauth2/token", data=...) to reuse pooled connections
+        session_id = f"session_{self._rng.hex(8)}"
         
         # Get or create Whoop tokens for this session
         whoop_tokens = self._whoop_tokens.get("default_session", {})
@@ -268,8 +566,8 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         self._whoop_tokens[session_id] = whoop_tokens.copy()
         
         # Generate MCP access token
-        access_token = secrets.token_urlsafe(32)
-        expires_at = int(time.time()) + 3600  # 1 hour
+        access_token = self._rng.urlsafe()
+        expires_at = int(_now()) + 3600  # 1 hour
         
         mcp_access_token = AccessToken(
             token=access_token,
@@ -280,18 +578,9 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         )
         
         # Store the access token
-        self._tokens[access_token] = mcp_access_token
-        self._save_tokens()
+        self._put("tokens", access_token, mcp_access_token)
         
-        # Generate refresh token
-        refresh_token = secrets.token_urlsafe(32)
-        
-        mcp_refresh_token = RefreshToken(
-            token=refresh_token,
-            client_id=client.client_id,
-            scopes=authorization_code.scopes,
-            expires_at=expires_at + 86400  # 24 hours
-        )
+        refresh_token = self._issue_refresh_token(client, authorization_code.scopes, expires_at)
         
         logger.info(f"Issued access token {access_token} for client {client.client_id}, session {session_id}")
         
@@ -303,13 +592,37 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             refresh_token=refresh_token
         )
     
+    def _issue_refresh_token(
+        self, client: OAuthClientInformationFull, scopes: list[str], access_expires_at: int
+    ) -> str:
+        """Generate and store a refresh token that outlives its access token by 24 hours."""
+        refresh_token = self._rng.urlsafe()
+        
+        mcp_refresh_token = RefreshToken(
+            token=refresh_token,
+            client_id=client.client_id,
+            scopes=scopes,
+            expires_at=access_expires_at + 86400  # 24 hours
+        )
+        
+        self._put("refresh_tokens", _refresh_key(refresh_token), mcp_refresh_token)
+        return refresh_token
+    
     async def load_refresh_token(
         self, client: OAuthClientInformationFull, refresh_token: str
     ) -> Optional[RefreshToken]:
         """Load refresh token by token string."""
-        # For simplicity, we'll store refresh tokens in the same tokens dict
-        # In a real implementation, you'd have a separate refresh token storage
-        return None  # Simplified for now
+        key = _refresh_key(refresh_token)
+        token = self._refresh_tokens.get(key)
+        if not token or token.client_id != client.client_id:
+            return None
+        
+        # Check if expired
+        if token.expires_at and _now() > token.expires_at:
+            self._delete("refresh_tokens", key)
+            return None
+        
+        return token
     
     async def exchange_refresh_token(
         self,
@@ -318,12 +631,14 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
         scopes: list[str],
     ) -> OAuthToken:
         """Exchange refresh token for new access token."""
-        # For now, just issue a new access token
-        # In a real implementation, you'd validate the refresh token and potentially
-        # refresh the underlying Whoop tokens
+        # Rotate: the presented refresh token is single-use
+        key = _refresh_key(refresh_token.token)
+        if key not in self._refresh_tokens:
+            raise TokenError("invalid_grant", "Refresh token has been used or revoked")
+        self._delete("refresh_tokens", key)
         
-        access_token = secrets.token_urlsafe(32)
-        expires_at = int(time.time()) + 3600  # 1 hour
+        access_token = self._rng.urlsafe()
+        expires_at = int(_now()) + 3600  # 1 hour
         
         mcp_access_token = AccessToken(
             token=access_token,
@@ -332,8 +647,8 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             expires_at=expires_at
         )
         
-        self._tokens[access_token] = mcp_access_token
-        self._save_tokens()
+        self._put("tokens", access_token, mcp_access_token)
+        new_refresh_token = self._issue_refresh_token(client, scopes, expires_at)
         
         logger.info(f"Issued new access token {access_token} for client {client.client_id}")
         
@@ -341,32 +656,59 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
             access_token=access_token,
             token_type="Bearer",
             expires_in=3600,
-            scope=" ".join(scopes) if scopes else None
+            scope=" ".join(scopes) if scopes else None,
+            refresh_token=new_refresh_token
         )
     
     async def load_access_token(self, token: str) -> Optional[AccessToken]:
         """Load access token by token string."""
+        now = _now()
+        cached = self._token_lru.get(token)
+        if cached is not None and now < cached[1]:
+            self._token_lru.move_to_end(token)
+            return cached[0]
+        
+        if self._revoked_lru and _token_digest(token) in self._revoked_lru:
+            return None
+        
         access_token = self._tokens.get(token)
         if not access_token:
+            self._token_lru.pop(token, None)
             return None
         
         # Check if expired
-        if access_token.expires_at and time.time() > access_token.expires_at:
-            del self._tokens[token]
-            self._save_tokens()
+        if access_token.expires_at and now > access_token.expires_at:
+            self._token_lru.pop(token, None)
+            self._delete("tokens", token)
             return None
         
+        # Never trust the cached entry past the token's own expiry
+        valid_until = now + TOKEN_LRU_TTL
+        if access_token.expires_at:
+            valid_until = min(valid_until, access_token.expires_at)
+        self._token_lru[token] = (access_token, valid_until)
+        self._token_lru.move_to_end(token)
+        if len(self._token_lru) > TOKEN_LRU_SIZE:
+            self._token_lru.popitem(last=False)
         return access_token
     
     async def revoke_token(self, token: AccessToken | RefreshToken) -> None:
         """Revoke a token."""
         if isinstance(token, AccessToken):
+            self._token_lru.pop(token.token, None)
+            self._revoked_lru[_token_digest(token.token)] = None
+            if len(self._revoked_lru) > REVOKED_LRU_SIZE:
+                self._revoked_lru.popitem(last=False)
             if token.token in self._tokens:
-                del self._tokens[token.token]
-                self._save_tokens()
+                self._delete("tokens", token.token)
                 logger.info(f"Revoked access token {token.token}")
         
-        # For refresh tokens, we'd need separate storage
+        else:
+            key = _refresh_key(token.token)
+            if key in self._refresh_tokens:
+                self._delete("refresh_tokens", key)
+                logger.info("Revoked refresh token")
+        
         logger.info(f"Token revocation requested for {type(token).__name__}")
     
     def get_whoop_tokens_for_session(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -375,7 +717,7 @@ class WhoopOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, Ref
     
     def create_session_for_token(self, access_token: str) -> str:
         """Create a new session for an access token."""
-        session_id = f"session_{secrets.token_hex(8)}"
+        session_id = f"session_{self._rng.hex(8)}"
         
         # Copy default Whoop tokens to new session
         default_tokens = self._whoop_tokens.get("default_session", {})
@@ -4,44 +4,79 @@ MCP server for Whoop API integration.
 This server exposes methods to query the Whoop API for cycles, recovery, and strain data.
 """
 
+import asyncio
 import os
 import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+from statistics import fmean
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
 from dotenv import load_dotenv
 import logging
 
+import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp.server.fastmcp import FastMCP
-from whoop import WhoopClient
+from whoop import AUTH_URL, REQUEST_URL, WhoopClient
 
-# Configure logging
+# Configure logging (INFO unless LOG_LEVEL asks for more)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     stream=sys.stderr
 )
+# httpx logs every request at INFO; keep one line per Whoop API call out of the log
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
-# Create MCP server
-mcp = FastMCP("Whoop API MCP Server")
-
-# Initialize Whoop client
+# Initialize Whoop client (used for the password login) and the pooled HTTP client
+# every tool shares for API calls
 whoop_client: Optional[WhoopClient] = None
+http_client: Optional[httpx.AsyncClient] = None
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+ENV_PATH = CONFIG_DIR / '.env'
+# Session token cached between runs so a restart can skip the password login
+TOKEN_CACHE_PATH = CONFIG_DIR / '.whoop_token.json'
+TOKEN_MIN_VALIDITY = 60  # seconds a cached token must still be valid to be reused
+
+@asynccontextmanager
+async def lifespan(_: FastMCP) -> AsyncIterator[None]:
+    """Keep one keep-alive connection pool open for the lifetime of the server."""
+    global http_client
+    async with httpx.AsyncClient(
+        base_url=REQUEST_URL,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60),
+        timeout=30.0,
+    ) as client:
+        http_client = client
+        try:
+            yield
+        finally:
+            http_client = None
+
+# Create MCP server
+mcp = FastMCP("Whoop API MCP Server", lifespan=lifespan)
 
 def initialize_whoop_client() -> None:
     """Initialize the Whoop client using environment variables."""
     global whoop_client
     
     # Load environment variables
-    env_path = Path(__file__).parent.parent / 'config' / '.env'
-    logger.info(f"Looking for .env file at: {env_path}")
+    logger.info("Looking for .env file at: %s", ENV_PATH)
     
-    if not env_path.exists():
-        logger.error(f"Environment file not found at {env_path}")
+    if not ENV_PATH.exists():
+        logger.error("Environment file not found at %s", ENV_PATH)
         return
     
-    load_dotenv(dotenv_path=env_path)
+    load_dotenv(dotenv_path=ENV_PATH)
     logger.info("Environment variables loaded")
     
     # Get credentials
@@ -52,14 +87,289 @@ def initialize_whoop_client() -> None:
         logger.error("Missing Whoop credentials in environment variables")
         return
         
+    try:
+        whoop_client = _restore_whoop_client(email, password)
+        if whoop_client:
+            _mount_pool(whoop_client)
+            logger.info("Reusing cached Whoop session token")
+            return
+    except Exception as e:
+        logger.warning("Could not reuse cached Whoop token: %s", e)
+    
     try:
         whoop_client = WhoopClient(username=email, password=password)
+        _mount_pool(whoop_client)
+        _save_token(email)
         logger.info("Successfully authenticated with Whoop API")
     except Exception as e:
-        logger.error(f"Authentication failed: {str(e)}")
+        logger.error("Authentication failed: %s", e)
+
+def _mount_pool(client: WhoopClient) -> None:
+    """Pool and retry the client's own requests session, still used for logins, token
+    refreshes and the SDK calls tools make from worker threads."""
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.1))
+    client.session.mount("https://", adapter)
+
+def _restore_whoop_client(email: str, password: str) -> Optional[WhoopClient]:
+    """Build a client from the cached token, refreshing it if it is about to expire.
+    
+    Returns None when there is no usable cached token for this account.
+    """
+    try:
+        with open(TOKEN_CACHE_PATH, "rb") as f:
+            cached = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if cached.get("username") != email:
+        return None
+    
+    token = cached.get("token") or {}
+    client = WhoopClient(username=email, password=password, authenticate=False)
+    if token.get("expires_at", 0) - time.time() > TOKEN_MIN_VALIDITY:
+        client.session.token = token
+    elif token.get("refresh_token"):
+        client.session.refresh_token(f"{AUTH_URL}/oauth/token", refresh_token=token["refresh_token"])
+        _save_token(email, client)
+    else:
+        return None
+    client.user_id = str(client.session.token.get("user", {}).get("id", ""))
+    return client
+
+def _save_token(email: str, client: Optional[WhoopClient] = None) -> None:
+    """Cache the session token for the next start (owner-only, written atomically)."""
+    client = client or whoop_client
+    tmp_path = None
+    try:
+        # A temp file of its own (mkstemp creates it 0600), so concurrent writers never
+        # interleave into the same file before the rename
+        fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".whoop_token.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"username": email, "token": dict(client.session.token)}))
+        os.replace(tmp_path, TOKEN_CACHE_PATH)
+    except Exception as e:
+        logger.warning("Could not cache Whoop token: %s", e)
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+
+# Short-lived caches for repeated tool calls; entries expire a fixed time after they
+# were fetched (hits do not extend them). Body measurements change on the order of weeks,
+# so they are fetched once per day: the entry is keyed by date and the next day's key
+# evicts it.
+collection_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+body_measurement_cache: TTLCache = TTLCache(maxsize=1, ttl=24 * 3600)
+
+# Last good value per cache key with the time it was fetched, kept past the TTL so it
+# can be served while the Whoop API is down or rate limiting
+stale_cache: LRUCache = LRUCache(maxsize=256)
+# Fetch time of stale data served during the current tool call, if any
+stale_fetched_at: ContextVar[Optional[str]] = ContextVar("stale_fetched_at", default=None)
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an API failure is an outage worth answering from stale data."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+async def _cached(
+    cache: TTLCache, key: Any, fetch: Callable[[], Awaitable[Any]], stale_key: Any = None
+) -> Any:
+    """Return cache[key], calling fetch() to fill it on a miss.
+    
+    If the fetch fails transiently and stale_key (default: key) was fetched before, the
+    last good value is returned instead and its fetch time recorded in stale_fetched_at.
+    Keys that embed the date need a date-free stale_key, or the first fetch of a new
+    day could never fall back.
+    """
+    if stale_key is None:
+        stale_key = key
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    try:
+        value = await fetch()
+    except Exception as e:
+        if not _is_transient(e) or stale_key not in stale_cache:
+            raise
+        fetched_at, value = stale_cache[stale_key]
+        logger.warning("Whoop API unavailable (%s), serving data fetched at %s", e, fetched_at)
+        stale_fetched_at.set(fetched_at)
+        return value
+    cache[key] = value
+    stale_cache[stale_key] = (datetime.now(timezone.utc).isoformat(timespec="seconds"), value)
+    return value
+
+def _mark_stale(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Flag a tool result built from stale data, so callers know it may be out of date."""
+    fetched_at = stale_fetched_at.get()
+    if fetched_at:
+        result["stale"] = True
+        result["fetched_at"] = fetched_at
+    return result
+
+# Collection ranges wider than this are split into windows fetched concurrently;
+# Whoop pages with an opaque next_token, so pages of one range cannot be parallelized
+COLLECTION_WINDOW_DAYS = 20
+COLLECTION_MAX_CONCURRENCY = 4  # windows or by-id requests in flight at once, to stay under Whoop's rate limit
+COLLECTION_MAX_DAYS = 365
+
+def _window(start_day: date, end_day: date) -> tuple[str, str]:
+    """Whoop API start/end parameters covering start_day through end_day inclusive."""
+    return f"{start_day:%Y-%m-%d}T00:00:00Z", f"{end_day:%Y-%m-%d}T23:59:59Z"
+
+# A successful API request within this many seconds counts as proof of authentication,
+# so check_auth_status can answer from the profile it last fetched
+AUTH_CHECK_INTERVAL = 60
+last_api_success: float = 0.0
+auth_profile: Optional[Dict[str, Any]] = None
+
+# Last body seen per request URL with its ETag, so a repeat request can be made
+# conditional and answered by a bodyless 304
+etag_cache: LRUCache = LRUCache(maxsize=512)
+
+# Held while logging in again after a 401, so concurrent requests that all see the
+# expired token trigger a single password login
+relogin_lock = asyncio.Lock()
+
+def _request_headers(access_token: str, etag: Optional[str]) -> Dict[str, str]:
+    """Bearer auth header, plus If-None-Match when a previous ETag is known."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+async def _relogin(rejected_token: str) -> str:
+    """Repeat the password login unless another request already replaced rejected_token.
+    
+    Returns the access token to retry with.
+    """
+    async with relogin_lock:
+        if whoop_client.session.token["access_token"] == rejected_token:
+            await asyncio.to_thread(whoop_client.authenticate)
+            await asyncio.to_thread(_save_token, os.getenv("WHOOP_EMAIL"))
+        return whoop_client.session.token["access_token"]
+
+async def _request(url_slug: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """GET a Whoop API resource over the shared connection pool.
+    
+    On a 401 the password login is repeated once and the request retried.
+    """
+    global last_api_success
+    url = str(httpx.URL(url_slug, params=params))
+    etag, cached_body = etag_cache.get(url, (None, None))
+    access_token = whoop_client.session.token["access_token"]
+    response = await http_client.get(url, headers=_request_headers(access_token, etag))
+    if response.status_code == 401:
+        access_token = await _relogin(access_token)
+        response = await http_client.get(url, headers=_request_headers(access_token, etag))
+    if response.status_code == 304 and etag:
+        last_api_success = time.monotonic()
+        return cached_body
+    response.raise_for_status()
+    last_api_success = time.monotonic()
+    body = orjson.loads(response.content)
+    if response.headers.get("ETag"):
+        etag_cache[url] = (response.headers["ETag"], body)
+    return body
+
+async def _get_pages(url_slug: str, start: str, end: str) -> List[Dict[str, Any]]:
+    """Follow next_token through every page of a collection for one date window."""
+    params: Dict[str, Any] = {"start": start, "end": end, "limit": 25}
+    records: List[Dict[str, Any]] = []
+    while True:
+        page = await _request(url_slug, params)
+        records += page["records"]
+        if not page.get("next_token"):
+            return records
+        params["nextToken"] = page["next_token"]
+
+async def _get_latest(url_slug: str) -> List[Dict[str, Any]]:
+    """Fetch just the newest record of a collection endpoint (as a list), cached briefly."""
+    async def fetch() -> List[Dict[str, Any]]:
+        return (await _request(url_slug, {"limit": 1}))["records"]
+    return await _cached(collection_cache, (url_slug, "latest"), fetch)
+
+async def _get_collection(url_slug: str, days: int) -> List[Dict[str, Any]]:
+    """Fetch every record of a collection endpoint for the last `days` days, cached briefly."""
+    days = max(0, min(days, COLLECTION_MAX_DAYS))
+    # Keyed by day so a cached range never straddles midnight
+    today = datetime.now().date()
+    return await _cached(
+        collection_cache, (url_slug, days, today), lambda: _fetch_collection(url_slug, days, today),
+        stale_key=(url_slug, days)
+    )
+
+async def _get_by_ids(url_slug: str, ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch several records of one resource concurrently, in the order requested.
+    
+    Records present in a cached collection of the same resource are served from memory;
+    an id that cannot be fetched yields {"id": ..., "error": ...} in its place.
+    """
+    known: Dict[str, Dict[str, Any]] = {}
+    for key, records in list(collection_cache.items()):
+        if key[0] == url_slug and isinstance(records, list):
+            known.update((str(record.get("id")), record) for record in records)
+    
+    missing = [record_id for record_id in dict.fromkeys(ids) if record_id not in known]
+    semaphore = asyncio.Semaphore(COLLECTION_MAX_CONCURRENCY)
+    
+    async def fetch_record(record_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _request(f"{url_slug}/{record_id}")
+    
+    fetched = await asyncio.gather(
+        *(fetch_record(record_id) for record_id in missing), return_exceptions=True
+    )
+    for record_id, record in zip(missing, fetched):
+        if isinstance(record, Exception):
+            logger.error("Error getting %s/%s: %s", url_slug, record_id, record)
+            record = {"id": record_id, "error": str(record)}
+        known[record_id] = record
+    return [known[record_id] for record_id in ids]
+
+async def _fetch_collection(url_slug: str, days: int, today: date) -> List[Dict[str, Any]]:
+    """Fetch every record of a collection endpoint for the `days` days up to today.
+    
+    Wide ranges are fetched as concurrent windows, newest first, so the merged
+    result keeps the API's descending order.
+    """
+    first_day = today - timedelta(days=days)
+    windows = []
+    window_end = today
+    while window_end >= first_day:
+        window_start = max(first_day, window_end - timedelta(days=COLLECTION_WINDOW_DAYS - 1))
+        windows.append(_window(window_start, window_end))
+        window_end = window_start - timedelta(days=1)
+    
+    if len(windows) == 1:
+        return await _get_pages(url_slug, *windows[0])
+    
+    semaphore = asyncio.Semaphore(COLLECTION_MAX_CONCURRENCY)
+    
+    async def fetch_window(start: str, end: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await _get_pages(url_slug, start, end)
+    
+    tasks = [asyncio.ensure_future(fetch_window(start, end)) for start, end in windows]
+    try:
+        pages = await asyncio.gather(*tasks)
+    except BaseException:
+        # One failed window fails the whole range; stop fetching the others
+        for task in tasks:
+            task.cancel()
+        raise
+    # A record spanning a window boundary can be returned by both windows
+    records: List[Dict[str, Any]] = []
+    seen = set()
+    for page in pages:
+        for record in page:
+            if record.get("id") not in seen:
+                seen.add(record.get("id"))
+                records.append(record)
+    return records
 
 @mcp.tool()
-def get_latest_cycle() -> Dict[str, Any]:
+async def get_latest_cycle() -> Dict[str, Any]:
     """
     Get the latest cycle data from Whoop.
     
@@ -70,13 +380,10 @@ def get_latest_cycle() -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Get today's date and yesterday's date
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        # Get cycle collection for the last day - pass as positional arguments
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
-        logger.debug(f"Received cycles response: {cycles}")
+        # Only the newest cycle is needed; the API returns cycles newest first
+        cycles = await _get_latest("v1/cycle")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received cycles response: %s", cycles)
         
         if not cycles:
             return {"error": "No cycle data available"}
@@ -88,17 +395,17 @@ def get_latest_cycle() -> Dict[str, Any]:
         if latest_cycle.get('score') and latest_cycle['score'].get('recovery'):
             recovery_score = latest_cycle['score']['recovery']
             
-        return {
+        return _mark_stale({
             "cycle": latest_cycle,
             "recovery_score": recovery_score,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
-        logger.error(f"Error getting latest cycle: {str(e)}")
+        logger.error("Error getting latest cycle: %s", e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_average_strain(days: int = 7) -> Dict[str, Any]:
+async def get_average_strain(days: int = 7) -> Dict[str, Any]:
     """
     Calculate average strain over the specified number of days.
     
@@ -112,42 +419,39 @@ def get_average_strain(days: int = 7) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
         # Get cycle collection
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
+        cycles = await _get_collection("v1/cycle", days)
         if not cycles:
             return {"error": "No cycle data available"}
             
         # Extract strain values
         strains = []
         for cycle in cycles:
-            if cycle.get('score') and cycle['score'].get('strain'):
+            if cycle.get('score') and cycle['score'].get('strain') is not None:
                 strains.append(cycle['score']['strain'])
         
         if not strains:
             return {"error": "No strain data available"}
             
-        return {
-            "average_strain": sum(strains) / len(strains),
+        return _mark_stale({
+            "average_strain": fmean(strains),
             "days_analyzed": days,
             "samples": len(strains),
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
-        logger.error(f"Error calculating average strain: {str(e)}")
+        logger.error("Error calculating average strain: %s", e)
         return {"error": str(e)}
 
 @mcp.tool()
-def check_auth_status() -> Dict[str, Any]:
+async def check_auth_status() -> Dict[str, Any]:
     """
     Check if we're authenticated with Whoop.
     
     Returns:
         Dictionary containing authentication status and profile info if available
     """
+    global auth_profile
     if not whoop_client:
         return {
             "authenticated": False,
@@ -155,8 +459,11 @@ def check_auth_status() -> Dict[str, Any]:
         }
     
     try:
-        # Test authentication by getting profile
-        profile = whoop_client.get_profile()
+        # Test authentication by getting profile, unless another request just succeeded
+        if auth_profile is not None and time.monotonic() - last_api_success < AUTH_CHECK_INTERVAL:
+            profile = auth_profile
+        else:
+            profile = auth_profile = await _request("v1/user/profile/basic")
         return {
             "authenticated": True,
             "message": "Successfully authenticated with Whoop",
@@ -170,7 +477,7 @@ def check_auth_status() -> Dict[str, Any]:
         }
 
 @mcp.tool()
-def get_cycles(days: int = 10) -> List[Dict[str, Any]]:
+async def get_cycles(days: int = 10) -> Dict[str, Any]:
     """
     Get multiple cycles from Whoop API.
     
@@ -178,33 +485,27 @@ def get_cycles(days: int = 10) -> List[Dict[str, Any]]:
         days: Number of days to fetch (default: 10)
         
     Returns:
-        List of cycle data dictionaries
+        Dict with the fetch timestamp and the list of cycle records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
         # Get cycle collection
-        cycles = whoop_client.get_cycle_collection(start_date, end_date)
+        cycles = await _get_collection("v1/cycle", days)
         if not cycles:
-            return [{"error": "No cycle data available"}]
+            return {"error": "No cycle data available"}
             
-        return [{
-            "cycle": cycle,
-            "timestamp": datetime.now().isoformat()
-        } for cycle in cycles]
+        timestamp = datetime.now().isoformat()
+        return _mark_stale({"timestamp": timestamp, "records": cycles})
     except Exception as e:
-        logger.error(f"Error getting cycles: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting cycles: %s", e)
+        return {"error": str(e)}
 
 # NEW: Specific ID-Based Retrieval Methods
 
 @mcp.tool()
-def get_cycle_by_id(cycle_id: str) -> Dict[str, Any]:
+async def get_cycle_by_id(cycle_id: str) -> Dict[str, Any]:
     """
     Get a specific cycle by its ID from Whoop API.
     
@@ -218,7 +519,7 @@ def get_cycle_by_id(cycle_id: str) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        cycle = whoop_client.get_cycle(cycle_id)  # Assumes this method exists
+        cycle = await _request(f"v1/cycle/{cycle_id}")
         if not cycle:
             return {"error": f"No cycle found with ID {cycle_id}"}
         return {
@@ -226,11 +527,11 @@ def get_cycle_by_id(cycle_id: str) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting cycle {cycle_id}: {str(e)}")
+        logger.error("Error getting cycle %s: %s", cycle_id, e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_recovery_by_id(recovery_id: str) -> Dict[str, Any]:
+async def get_recovery_by_id(recovery_id: str) -> Dict[str, Any]:
     """
     Get a specific recovery entry by its ID from Whoop API.
     
@@ -244,7 +545,7 @@ def get_recovery_by_id(recovery_id: str) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        recovery = whoop_client.get_recovery(recovery_id)  # Assumes this method exists
+        recovery = await asyncio.to_thread(whoop_client.get_recovery, recovery_id)  # Assumes this method exists
         if not recovery:
             return {"error": f"No recovery found with ID {recovery_id}"}
         return {
@@ -252,11 +553,11 @@ def get_recovery_by_id(recovery_id: str) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting recovery {recovery_id}: {str(e)}")
+        logger.error("Error getting recovery %s: %s", recovery_id, e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_sleep_by_id(sleep_id: str) -> Dict[str, Any]:
+async def get_sleep_by_id(sleep_id: str) -> Dict[str, Any]:
     """
     Get a specific sleep entry by its ID from Whoop API.
     
@@ -270,7 +571,7 @@ def get_sleep_by_id(sleep_id: str) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        sleep = whoop_client.get_sleep(sleep_id)  # Assumes this method exists
+        sleep = await _request(f"v1/activity/sleep/{sleep_id}")
         if not sleep:
             return {"error": f"No sleep found with ID {sleep_id}"}
         return {
@@ -278,11 +579,11 @@ def get_sleep_by_id(sleep_id: str) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting sleep {sleep_id}: {str(e)}")
+        logger.error("Error getting sleep %s: %s", sleep_id, e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_workout_by_id(workout_id: str) -> Dict[str, Any]:
+async def get_workout_by_id(workout_id: str) -> Dict[str, Any]:
     """
     Get a specific workout by its ID from Whoop API.
     
@@ -296,7 +597,7 @@ def get_workout_by_id(workout_id: str) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        workout = whoop_client.get_workout(workout_id)  # Assumes this method exists
+        workout = await _request(f"v1/activity/workout/{workout_id}")
         if not workout:
             return {"error": f"No workout found with ID {workout_id}"}
         return {
@@ -304,11 +605,11 @@ def get_workout_by_id(workout_id: str) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting workout {workout_id}: {str(e)}")
+        logger.error("Error getting workout %s: %s", workout_id, e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_strain_by_id(strain_id: str) -> Dict[str, Any]:
+async def get_strain_by_id(strain_id: str) -> Dict[str, Any]:
     """
     Get a specific strain entry by its ID from Whoop API.
     
@@ -322,7 +623,7 @@ def get_strain_by_id(strain_id: str) -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        strain = whoop_client.get_strain(strain_id)  # Assumes this method exists
+        strain = await asyncio.to_thread(whoop_client.get_strain, strain_id)  # Assumes this method exists
         if not strain:
             return {"error": f"No strain found with ID {strain_id}"}
         return {
@@ -330,13 +631,76 @@ def get_strain_by_id(strain_id: str) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting strain {strain_id}: {str(e)}")
+        logger.error("Error getting strain %s: %s", strain_id, e)
+        return {"error": str(e)}
+
+@mcp.tool()
+async def get_cycles_by_ids(cycle_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get several cycles by their IDs from Whoop API in one call.
+    
+    Args:
+        cycle_ids: The IDs of the cycles to retrieve
+        
+    Returns:
+        Dict with the fetch timestamp and the cycle records, in the order requested
+    """
+    if not whoop_client:
+        return {"error": "Not authenticated with Whoop"}
+    
+    try:
+        cycles = await _get_by_ids("v1/cycle", cycle_ids)
+        return {"timestamp": datetime.now().isoformat(), "records": cycles}
+    except Exception as e:
+        logger.error("Error getting cycles %s: %s", cycle_ids, e)
+        return {"error": str(e)}
+
+@mcp.tool()
+async def get_sleeps_by_ids(sleep_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get several sleeps by their IDs from Whoop API in one call.
+    
+    Args:
+        sleep_ids: The IDs of the sleeps to retrieve
+        
+    Returns:
+        Dict with the fetch timestamp and the sleep records, in the order requested
+    """
+    if not whoop_client:
+        return {"error": "Not authenticated with Whoop"}
+    
+    try:
+        sleeps = await _get_by_ids("v1/activity/sleep", sleep_ids)
+        return {"timestamp": datetime.now().isoformat(), "records": sleeps}
+    except Exception as e:
+        logger.error("Error getting sleeps %s: %s", sleep_ids, e)
+        return {"error": str(e)}
+
+@mcp.tool()
+async def get_workouts_by_ids(workout_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get several workouts by their IDs from Whoop API in one call.
+    
+    Args:
+        workout_ids: The IDs of the workouts to retrieve
+        
+    Returns:
+        Dict with the fetch timestamp and the workout records, in the order requested
+    """
+    if not whoop_client:
+        return {"error": "Not authenticated with Whoop"}
+    
+    try:
+        workouts = await _get_by_ids("v1/activity/workout", workout_ids)
+        return {"timestamp": datetime.now().isoformat(), "records": workouts}
+    except Exception as e:
+        logger.error("Error getting workouts %s: %s", workout_ids, e)
         return {"error": str(e)}
 
 # NEW: Standalone Data Retrieval Methods
 
 @mcp.tool()
-def get_recoveries(days: int = 10) -> List[Dict[str, Any]]:
+async def get_recoveries(days: int = 10) -> Dict[str, Any]:
     """
     Get multiple recovery entries from Whoop API, independent of cycles.
     
@@ -344,31 +708,25 @@ def get_recoveries(days: int = 10) -> List[Dict[str, Any]]:
         days: Number of days to fetch (default: 10)
         
     Returns:
-        List of recovery data dictionaries
+        Dict with the fetch timestamp and the list of recovery records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
         # Get recovery collection
-        recoveries = whoop_client.get_recovery_collection(start_date, end_date)  # Assumes this method exists
+        recoveries = await _get_collection("v1/recovery", days)
         if not recoveries:
-            return [{"error": "No recovery data available"}]
+            return {"error": "No recovery data available"}
             
-        return [{
-            "recovery": recovery,
-            "timestamp": datetime.now().isoformat()
-        } for recovery in recoveries]
+        timestamp = datetime.now().isoformat()
+        return _mark_stale({"timestamp": timestamp, "records": recoveries})
     except Exception as e:
-        logger.error(f"Error getting recoveries: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting recoveries: %s", e)
+        return {"error": str(e)}
 
 @mcp.tool()
-def get_sleeps(days: int = 10) -> List[Dict[str, Any]]:
+async def get_sleeps(days: int = 10) -> Dict[str, Any]:
     """
     Get multiple sleep entries from Whoop API, independent of cycles.
     
@@ -376,31 +734,25 @@ def get_sleeps(days: int = 10) -> List[Dict[str, Any]]:
         days: Number of days to fetch (default: 10)
         
     Returns:
-        List of sleep data dictionaries
+        Dict with the fetch timestamp and the list of sleep records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
         # Get sleep collection
-        sleeps = whoop_client.get_sleep_collection(start_date, end_date)  # Assumes this method exists
+        sleeps = await _get_collection("v1/activity/sleep", days)
         if not sleeps:
-            return [{"error": "No sleep data available"}]
+            return {"error": "No sleep data available"}
             
-        return [{
-            "sleep": sleep,
-            "timestamp": datetime.now().isoformat()
-        } for sleep in sleeps]
+        timestamp = datetime.now().isoformat()
+        return _mark_stale({"timestamp": timestamp, "records": sleeps})
     except Exception as e:
-        logger.error(f"Error getting sleeps: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting sleeps: %s", e)
+        return {"error": str(e)}
 
 @mcp.tool()
-def get_workouts(days: int = 10) -> List[Dict[str, Any]]:
+async def get_workouts(days: int = 10) -> Dict[str, Any]:
     """
     Get multiple workout entries from Whoop API.
     
@@ -408,31 +760,25 @@ def get_workouts(days: int = 10) -> List[Dict[str, Any]]:
         days: Number of days to fetch (default: 10)
         
     Returns:
-        List of workout data dictionaries
+        Dict with the fetch timestamp and the list of workout records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
         # Get workout collection
-        workouts = whoop_client.get_workout_collection(start_date, end_date)  # Assumes this method exists
+        workouts = await _get_collection("v1/activity/workout", days)
         if not workouts:
-            return [{"error": "No workout data available"}]
+            return {"error": "No workout data available"}
             
-        return [{
-            "workout": workout,
-            "timestamp": datetime.now().isoformat()
-        } for workout in workouts]
+        timestamp = datetime.now().isoformat()
+        return _mark_stale({"timestamp": timestamp, "records": workouts})
     except Exception as e:
-        logger.error(f"Error getting workouts: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting workouts: %s", e)
+        return {"error": str(e)}
 
 @mcp.tool()
-def get_strains(days: int = 10) -> List[Dict[str, Any]]:
+async def get_strains(days: int = 10) -> Dict[str, Any]:
     """
     Get multiple strain entries from Whoop API, independent of cycles.
     
@@ -440,33 +786,32 @@ def get_strains(days: int = 10) -> List[Dict[str, Any]]:
         days: Number of days to fetch (default: 10)
         
     Returns:
-        List of strain data dictionaries
+        Dict with the fetch timestamp and the list of strain records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
         # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        now = datetime.now()
+        end_date = now.strftime("%Y-%m-%d")
+        start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
         
         # Get strain collection
-        strains = whoop_client.get_strain_collection(start_date, end_date)  # Assumes this method exists
+        strains = await asyncio.to_thread(whoop_client.get_strain_collection, start_date, end_date)  # Assumes this method exists
         if not strains:
-            return [{"error": "No strain data available"}]
+            return {"error": "No strain data available"}
             
-        return [{
-            "strain": strain,
-            "timestamp": datetime.now().isoformat()
-        } for strain in strains]
+        timestamp = now.isoformat()
+        return {"timestamp": timestamp, "records": strains}
     except Exception as e:
-        logger.error(f"Error getting strains: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting strains: %s", e)
+        return {"error": str(e)}
 
 # User Measurements Retrieval
 
 @mcp.tool()
-def get_user_body_measurements() -> Dict[str, Any]:
+async def get_user_body_measurements() -> Dict[str, Any]:
     """
     Get the user's body measurements from Whoop.
     Uses /v1/user/measurement/body endpoint.
@@ -479,21 +824,24 @@ def get_user_body_measurements() -> Dict[str, Any]:
     
     try:
         # API endpoint: GET /v1/user/measurement/body
-        measurements = whoop_client.get_body_measurement()
+        measurements = await _cached(
+            body_measurement_cache, date.today(), lambda: _request("v1/user/measurement/body"),
+            stale_key="v1/user/measurement/body"
+        )
         
         if not measurements:
             return {"error": "No body measurement data available"}
             
-        return {
+        return _mark_stale({
             "measurements": measurements,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
-        logger.error(f"Error getting body measurements: {str(e)}")
+        logger.error("Error getting body measurements: %s", e)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_latest_recovery() -> Dict[str, Any]:
+async def get_latest_recovery() -> Dict[str, Any]:
     """
     Get the latest recovery data from Whoop.
     Uses /v1/recovery endpoint.
@@ -505,33 +853,29 @@ def get_latest_recovery() -> Dict[str, Any]:
         return {"error": "Not authenticated with Whoop"}
     
     try:
-        # Get today's recovery data
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
         # API endpoint: GET /v1/recovery
-        # Parameters: start, end, limit=10 (default)
-        recoveries = whoop_client.get_recovery_collection(start_date, end_date)
+        # Parameters: limit=1, as only the newest record is needed
+        recoveries = await _get_latest("v1/recovery")
         
-        if not recoveries or not recoveries.get('records'):
+        if not recoveries:
             return {"error": "No recent recovery data available"}
             
         # Get the first record (most recent as API sorts by sleep start time descending)
-        latest_recovery = recoveries['records'][0]
+        latest_recovery = recoveries[0]
         
-        return {
+        return _mark_stale({
             "recovery": latest_recovery,
             "recovery_score": latest_recovery.get('score', {}).get('recovery_score'),
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
-        logger.error(f"Error getting latest recovery: {str(e)}")
+        logger.error("Error getting latest recovery: %s", e)
         return {"error": str(e)}
 
 # Team-Related Functionality (Optional)
 
 @mcp.tool()
-def get_team_members(team_id: str) -> List[Dict[str, Any]]:
+async def get_team_members(team_id: str) -> Dict[str, Any]:
     """
     Get team member data from Whoop API.
     
@@ -539,22 +883,20 @@ def get_team_members(team_id: str) -> List[Dict[str, Any]]:
         team_id: The ID of the team to retrieve members for
         
     Returns:
-        List of team member data dictionaries
+        Dict with the fetch timestamp and the list of team member records
     """
     if not whoop_client:
-        return [{"error": "Not authenticated with Whoop"}]
+        return {"error": "Not authenticated with Whoop"}
     
     try:
-        members = whoop_client.get_team_members(team_id)  # Assumes this method exists
+        members = await asyncio.to_thread(whoop_client.get_team_members, team_id)  # Assumes this method exists
         if not members:
-            return [{"error": f"No members found for team {team_id}"}]
-        return [{
-            "member": member,
-            "timestamp": datetime.now().isoformat()
-        } for member in members]
+            return {"error": f"No members found for team {team_id}"}
+        timestamp = datetime.now().isoformat()
+        return {"timestamp": timestamp, "records": members}
     except Exception as e:
-        logger.error(f"Error getting team members for team {team_id}: {str(e)}")
-        return [{"error": str(e)}]
+        logger.error("Error getting team members for team %s: %s", team_id, e)
+        return {"error": str(e)}
 
 def main() -> None:
     """Main entry point for the server."""
@@ -564,7 +906,7 @@ def main() -> None:
         logger.info("Running MCP server with stdio transport")
         mcp.run(transport="stdio")
     except Exception as e:
-        logger.error(f"Server error: {str(e)}", exc_info=True)
+        logger.error("Server error: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
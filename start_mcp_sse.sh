@@ -10,4 +10,4 @@ set +a
 
 export MCP_SSE_PORT=8003
 echo "🚀 Starting Whoop MCP SSE server with OAuth..."
-python src/whoop_mcp_sse_server.py
+python -m src.whoop_mcp_sse_server
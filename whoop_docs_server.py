@@ -6,17 +6,14 @@ This server provides a public documentation page for the Whoop MCP server.
 """
 
 import os
-from datetime import datetime
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 
+from src.docs_page import page_response
+
 app = FastAPI(title="Whoop MCP Server Documentation", version="1.13.2")
 
-@app.get("/", response_class=HTMLResponse)
-async def documentation():
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    html_content = f"""
+DOCUMENTATION_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -195,9 +192,11 @@ async def documentation():
     </div>
 </body>
 </html>
-    """
-    
-    return HTMLResponse(content=html_content)
+"""
+
+@app.get("/", response_class=HTMLResponse)
+async def documentation():
+    return page_response(DOCUMENTATION_HTML)
 
 if __name__ == "__main__":
     import uvicorn